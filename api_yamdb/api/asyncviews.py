@@ -0,0 +1,58 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .timing import request_timings
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor(workers):
+    return ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix='async-read'
+    )
+
+
+def run_view(view, request, *args, **kwargs):
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            timings = request_timings.get()
+            if timings is not None:
+                timings.view_end = time.perf_counter()
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return await sync_to_async(view)(request, *args, **kwargs)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            get_executor(settings.ASYNC_READS['WORKERS']),
+            functools.partial(
+                context.run, run_view, view, request, *args, **kwargs
+            ),
+        )
+    return wrapper
+
+
+class AsyncReadMixin:
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_READS['ENABLED']:
+            return view
+        return async_read_view(view)
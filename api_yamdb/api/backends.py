@@ -1,53 +1,178 @@
+import hashlib
+import threading
+import time
+
 import jwt
 from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import authentication, exceptions
 
 from reviews.models import User
+from users.models import DeletedUser, TokenUser
+from .cache import LRUCache, bump_version, get_version
 
+ROLE_CLAIMS = ('username', 'role', 'is_active', 'token_version')
+REVOKED = -1
+INVALID_TOKEN = object()
 
-class JWTAuthentication(authentication.BaseAuthentication):
-    www_authenticate_realm = 'api'
-    authentication_header_prefix = 'Bearer'
 
-    def authenticate(self, request, token=None):
-        request.user = None
-        auth_header = authentication.get_authorization_header(request).split()
-        auth_header_prefix = self.authentication_header_prefix.lower()
+def deleted_since():
+    return timezone.now() - settings.JWT_AUTH['ACCESS_TOKEN_LIFETIME']
 
-        if not auth_header or len(auth_header) != 2:
-            return None
 
-        prefix, token = (
-            auth_header[0].decode('utf-8').lower(),
-            auth_header[1].decode('utf-8')
+class TokenVersionTable:
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self._versions = {}
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        rows = User.objects.filter(
+            Q(token_version__gt=0) | Q(is_active=False)
+        ).values_list('pk', 'token_version', 'is_active')
+        versions = {
+            pk: version if is_active else REVOKED
+            for pk, version, is_active in rows
+        }
+        versions.update(dict.fromkeys(
+            DeletedUser.objects.filter(
+                deleted_at__gte=deleted_since()
+            ).values_list('user_id', flat=True),
+            REVOKED,
+        ))
+        with self._lock:
+            self._versions = versions
+            self._expires = time.monotonic() + self.refresh_interval
+
+    def is_current(self, user_id, version):
+        if time.monotonic() >= self._expires:
+            self.refresh()
+        return self._versions.get(user_id, 0) == version
+
+    def update(self, user_id, version):
+        with self._lock:
+            if version:
+                self._versions[user_id] = version
+            else:
+                self._versions.pop(user_id, None)
+
+    def mark_deleted(self, user_id):
+        self.update(user_id, REVOKED)
+        DeletedUser.objects.filter(deleted_at__lt=deleted_since()).delete()
+        DeletedUser.objects.update_or_create(
+            user_id=user_id, defaults={'deleted_at': timezone.now()}
         )
 
-        if prefix != auth_header_prefix:
-            return None
-        return self._authenticate_credentials(request, token)
+    def clear(self):
+        with self._lock:
+            self._versions = {}
+            self._expires = 0
 
-    def authenticate_header(self, request):
-        return f'Basic realm={self.www_authenticate_realm}'
 
-    def _authenticate_credentials(self, request, token):
+user_cache = LRUCache(
+    settings.JWT_AUTH['USER_CACHE_SIZE'],
+    settings.JWT_AUTH['USER_CACHE_TTL'],
+)
+token_versions = TokenVersionTable(
+    settings.JWT_AUTH['TOKEN_VERSION_REFRESH_INTERVAL']
+)
+token_cache = LRUCache(
+    settings.JWT_AUTH['TOKEN_CACHE_SIZE'],
+    settings.JWT_AUTH['ACCESS_TOKEN_LIFETIME'].total_seconds(),
+)
+
+
+def user_version_prefix(user_id):
+    return f'jwt:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    user_cache.delete(user_id)
+    bump_version(user_version_prefix(user_id))
+
+
+def decode_token(token):
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
         try:
             payload = jwt.decode(
                 token,
                 settings.SECRET_KEY,
                 algorithms='HS256'
             )
-        except exceptions.AuthenticationFailed:
-            msg = 'Invalid authentication. Could not decode token.'
-            raise exceptions.AuthenticationFailed(msg)
+        except jwt.InvalidTokenError:
+            payload = INVALID_TOKEN
+            ttl = settings.JWT_AUTH['INVALID_TOKEN_CACHE_TTL']
+        else:
+            ttl = payload.get('exp', time.time() + token_cache.ttl)
+            ttl = min(ttl - time.time(), token_cache.ttl)
+        token_cache.set(key, payload, ttl=ttl)
+    if payload is INVALID_TOKEN:
+        msg = 'Invalid authentication. Could not decode token.'
+        raise exceptions.AuthenticationFailed(msg)
+    return payload
 
-        try:
-            user = User.objects.get(pk=payload['user_id'])
-        except User.DoesNotExist:
-            msg = 'No user matching this token was found.'
-            raise exceptions.AuthenticationFailed(msg)
+
+class JWTAuthentication(authentication.BaseAuthentication):
+    www_authenticate_realm = 'api'
+    authentication_header_prefix = 'Bearer'
+    scheme_handlers = {
+        'bearer': '_authenticate_credentials',
+    }
+
+    def authenticate(self, request):
+        auth_header = request.META.get('HTTP_AUTHORIZATION')
+        if not auth_header:
+            return None
+
+        parts = auth_header.split()
+        if len(parts) != 2:
+            return None
+
+        scheme, token = parts
+        handler = self.scheme_handlers.get(scheme.lower())
+        if handler is None:
+            return None
+        return getattr(self, handler)(request, token)
+
+    def authenticate_header(self, request):
+        return f'Basic realm={self.www_authenticate_realm}'
+
+    def _authenticate_credentials(self, request, token):
+        payload = decode_token(token)
+
+        if (
+            settings.JWT_AUTH['ROLE_CLAIMS']
+            and all(claim in payload for claim in ROLE_CLAIMS)
+        ):
+            return self._authenticate_claims(payload), token
+
+        version = get_version(user_version_prefix(payload['user_id']))
+        user, cached_version = user_cache.get(
+            payload['user_id'], (None, None)
+        )
+        if user is None or cached_version != version:
+            generation = user_cache.generation
+            try:
+                user = User.objects.get(pk=payload['user_id'])
+            except User.DoesNotExist:
+                msg = 'No user matching this token was found.'
+                raise exceptions.AuthenticationFailed(msg)
+            user_cache.set(user.pk, (user, version), generation=generation)
 
         if not user.is_active:
             msg = 'This user has been deactivated.'
             raise exceptions.AuthenticationFailed(msg)
 
         return user, token
+
+    def _authenticate_claims(self, payload):
+        if not payload['is_active'] or not token_versions.is_current(
+            payload['user_id'], payload['token_version']
+        ):
+            msg = 'This token has been revoked.'
+            raise exceptions.AuthenticationFailed(msg)
+        return TokenUser.from_payload(payload)
@@ -0,0 +1,152 @@
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre, User
+from reviews.ratings import apply_rating_delta
+
+
+def bulk_items(data, limit):
+    if not isinstance(data, list):
+        raise ValidationError(
+            {'non_field_errors': ['Ожидается список объектов.']}
+        )
+    if not data:
+        raise ValidationError(
+            {'non_field_errors': ['Список объектов пуст.']}
+        )
+    if len(data) > limit:
+        raise ValidationError({'non_field_errors': [
+            f'За один запрос можно передать не больше {limit} объектов.'
+        ]})
+    return data
+
+
+def collect_values(items, key, many=False):
+    values = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        value = item.get(key)
+        if many and isinstance(value, list):
+            values.update(slug for slug in value if isinstance(slug, str))
+        elif isinstance(value, str):
+            values.add(value)
+    return values
+
+
+def collect_ids(items, key):
+    ids = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            ids.add(int(item.get(key)))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def resolve_title_slugs(items):
+    return {
+        'genres': Genre.objects.in_bulk(
+            collect_values(items, 'genre', many=True), field_name='slug'
+        ),
+        'categories': Category.objects.in_bulk(
+            collect_values(items, 'category'), field_name='slug'
+        ),
+    }
+
+
+def bulk_create_titles(items):
+    titles = []
+    title_genres = []
+    for data in items:
+        data = dict(data)
+        genres = data.pop('genre')
+        title = Title(**data)
+        titles.append(title)
+        title_genres.append((title, genres))
+    with transaction.atomic():
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(titles)
+        else:
+            for title in titles:
+                title.save()
+        TitleGenre.objects.bulk_create([
+            TitleGenre(title=title, genre=genre)
+            for title, genres in title_genres
+            for genre in genres
+        ])
+    prefetch_related_objects(
+        titles, Prefetch('genre', queryset=Genre.objects.order_by('pk'))
+    )
+    return titles
+
+
+def resolve_review_relations(items):
+    titles = Title.objects.in_bulk(collect_ids(items, 'title'))
+    authors = User.objects.in_bulk(
+        collect_values(items, 'author'), field_name='username'
+    )
+    reviewed = set(Review.objects.filter(
+        title_id__in=titles,
+        author_id__in=[author.pk for author in authors.values()],
+    ).values_list('title_id', 'author_id')) if titles and authors else set()
+    return {'titles': titles, 'authors': authors, 'reviewed': reviewed}
+
+
+def bulk_create_reviews(items):
+    reviews = [Review(**data) for data in items]
+    totals = defaultdict(lambda: [0, 0])
+    for review in reviews:
+        totals[review.title_id][0] += review.score
+        totals[review.title_id][1] += 1
+    with transaction.atomic():
+        Review.objects.bulk_create(reviews)
+        for title_id, (score, count) in totals.items():
+            apply_rating_delta(title_id, score, count)
+    if reviews and reviews[0].pk is None:
+        ids = {
+            (title_id, author_id): pk
+            for title_id, author_id, pk in Review.objects.filter(
+                title_id__in=totals,
+                author_id__in={review.author_id for review in reviews},
+            ).values_list('title_id', 'author_id', 'pk')
+        }
+        for review in reviews:
+            review.pk = ids[review.title_id, review.author_id]
+    return reviews
+
+
+def bulk_results(item_serializers, objects, serializer_class):
+    objects = iter(objects)
+    results = []
+    for index, serializer in enumerate(item_serializers):
+        if serializer.errors:
+            results.append({
+                'index': index,
+                'status': status.HTTP_400_BAD_REQUEST,
+                'errors': serializer.errors,
+            })
+        else:
+            results.append({
+                'index': index,
+                'status': status.HTTP_201_CREATED,
+                'data': serializer_class(next(objects)).data,
+            })
+    return results
+
+
+def bulk_response_status(results):
+    created = sum(
+        result['status'] == status.HTTP_201_CREATED for result in results
+    )
+    if created == len(results):
+        return status.HTTP_201_CREATED
+    if not created:
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_207_MULTI_STATUS
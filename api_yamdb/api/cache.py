@@ -0,0 +1,102 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+
+def version_key(prefix):
+    return f'{prefix}:version'
+
+
+def get_version(prefix):
+    version = cache.get(version_key(prefix))
+    if version is None:
+        cache.add(version_key(prefix), int(time.time() * 1000), None)
+        version = cache.get(version_key(prefix))
+    return version
+
+
+def bump_version(prefix):
+    try:
+        cache.incr(version_key(prefix))
+    except ValueError:
+        get_version(prefix)
+
+
+def list_cache_key(prefix, request):
+    params = sorted(request.query_params.lists())
+    digest = hashlib.md5(
+        f'{request.get_host()}?{params}'.encode()
+    ).hexdigest()
+    return f'{prefix}:{get_version(prefix)}:{digest}'
+
+
+class CachedListMixin:
+    def get_cache_prefix(self):
+        return self.queryset.model._meta.label_lower
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.get_cache_prefix(), request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+
+class LRUCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None, generation=None):
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'max_size': self.max_size,
+        }
@@ -1,6 +1,12 @@
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import Title, TitleGenre
+from reviews.search import search_titles
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,14 +14,18 @@ class TitleFilter(filters.FilterSet):
         field_name='name',
         lookup_expr='icontains',
     )
-    category = filters.CharFilter(
+    category = CharInFilter(
         field_name='category__slug',
-        lookup_expr='icontains',
+        lookup_expr='in',
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
+    category__contains = filters.CharFilter(
+        field_name='category__slug',
         lookup_expr='icontains',
     )
+    genre = CharInFilter(method='filter_genre')
+    genre__all = CharInFilter(method='filter_genre_all')
+    genre__contains = filters.CharFilter(method='filter_genre_contains')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
@@ -25,3 +35,24 @@ class TitleFilter(filters.FilterSet):
             'genre',
             'category',
         ]
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.filter(pk__in=TitleGenre.objects.filter(
+            genre__slug__in=value,
+        ).values('title_id'))
+
+    def filter_genre_all(self, queryset, name, value):
+        slugs = {slug for slug in value if slug}
+        return queryset.filter(pk__in=TitleGenre.objects.filter(
+            genre__slug__in=slugs,
+        ).values('title_id').annotate(
+            matched=Count('genre_id'),
+        ).filter(matched=len(slugs)).values('title_id'))
+
+    def filter_genre_contains(self, queryset, name, value):
+        return queryset.filter(pk__in=TitleGenre.objects.filter(
+            genre__slug__icontains=value,
+        ).values('title_id'))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
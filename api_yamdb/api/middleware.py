@@ -0,0 +1,87 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.deprecation import MiddlewareMixin
+
+from api_yamdb.db_routers import choose_replica, read_replica
+from .timing import (
+    RequestTimings,
+    action_metrics,
+    request_timings,
+    server_timing_header,
+)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def sticky_key(request):
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    digest = hashlib.md5(authorization.encode()).hexdigest()
+    return f'replica:sticky:{digest}'
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            request.method in SAFE_METHODS
+            and getattr(view_class, 'replica_reads', False)
+        ):
+            key = sticky_key(request)
+            if key is None or not cache.get(key):
+                read_replica.set(choose_replica())
+
+    def process_response(self, request, response):
+        read_replica.set(None)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            key = sticky_key(request)
+            if key is not None:
+                cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+
+def action_name(request, view_func):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return None
+    method = request.method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class ServerTimingMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        if settings.SERVER_TIMING['ENABLED']:
+            request.timings = RequestTimings()
+            request_timings.set(request.timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, 'timings'):
+            request.timings.view_start = time.perf_counter()
+            request.timing_action = action_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, 'timings', None)
+        if timings is not None and timings.view_end is None:
+            timings.view_end = time.perf_counter()
+        return response
+
+    def process_response(self, request, response):
+        timings = getattr(request, 'timings', None)
+        if timings is None:
+            return response
+        request_timings.set(None)
+        metrics = timings.metrics(time.perf_counter())
+        response['Server-Timing'] = server_timing_header(
+            metrics, timings.queries
+        )
+        if settings.SERVER_TIMING['QUERY_COUNT_HEADER']:
+            response['X-Query-Count'] = str(timings.queries)
+        action = getattr(request, 'timing_action', None)
+        if action is not None:
+            action_metrics.record(action, timings.queries, metrics)
+        return response
@@ -0,0 +1,27 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('pub_date', 'id')
+    page_size_query_param = 'limit'
+
+
+class CursorOrLimitOffsetPagination(LimitOffsetPagination):
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        mode = request.query_params.get(self.mode_query_param)
+        if mode == self.cursor_mode:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
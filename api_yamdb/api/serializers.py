@@ -1,9 +1,15 @@
 from django.core.validators import RegexValidator
+from django.db.models import Q
 from rest_framework import serializers
 
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import ROLE_CHOICES, User
 
+SIGNUP_CONFLICT_MESSAGE = (
+    'А Вы точно зедсь первый раз?!'
+    'Я точно помню, что такие username и/или email уже видел!'
+)
+
 
 class UserSerializer(serializers.ModelSerializer):
     username = serializers.CharField(
@@ -85,22 +91,25 @@ class SignUpSerializer(serializers.Serializer):
     def validate(self, data):
         email = data.get('email')
         username = data.get('username')
-        if not User.objects.filter(username=username, email=email).exists():
-            if (
-                User.objects.filter(email=email).exists()
-                or User.objects.filter(username=username).exists()
-            ):
-                raise serializers.ValidationError(
-                    'А Вы точно зедсь первый раз?!'
-                    'Я точно помню, что такие username и/или email уже видел!'
-                )
         if username is not None and username.lower() == 'me':
             raise serializers.ValidationError(
                 f'username {username} зарезервировано!'
             )
+        users = list(
+            User.objects.filter(Q(username=username) | Q(email=email))[:2]
+        )
+        if any(
+            (user.username, user.email) != (username, email)
+            for user in users
+        ):
+            raise serializers.ValidationError(SIGNUP_CONFLICT_MESSAGE)
+        data['user'] = users[0] if users else None
         return data
 
     def create(self, validated_data):
+        user = validated_data.pop('user', None)
+        if user is not None:
+            return user
         return User.objects.create(**validated_data)
 
 
@@ -172,14 +181,40 @@ class TitleSerializer(serializers.ModelSerializer):
     description = serializers.CharField(
         required=False,
     )
-    rating = serializers.IntegerField(
-        source='reviews__score__avg',
-        read_only=True,
-    )
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'year',
+            'rating',
+            'description',
+            'genre',
+            'category',
+        )
+
+
+class TitleBulkSerializer(TitleSerializer):
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    def validate_genre(self, slugs):
+        genres = self.context['genres']
+        missing = [slug for slug in slugs if slug not in genres]
+        if missing:
+            raise serializers.ValidationError(
+                f'Жанры не найдены: {", ".join(missing)}'
+            )
+        return [genres[slug] for slug in dict.fromkeys(slugs)]
+
+    def validate_category(self, slug):
+        if slug not in self.context['categories']:
+            raise serializers.ValidationError(
+                f'Категория {slug} не найдена'
+            )
+        return self.context['categories'][slug]
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -209,6 +244,37 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
+class ReviewBulkSerializer(ReviewSerializer):
+    title = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('title', 'author', 'text', 'score')
+
+    def validate_title(self, title_id):
+        if title_id not in self.context['titles']:
+            raise serializers.ValidationError(
+                f'Произведение {title_id} не найдено'
+            )
+        return self.context['titles'][title_id]
+
+    def validate_author(self, username):
+        if username not in self.context['authors']:
+            raise serializers.ValidationError(
+                f'Пользователь {username} не найден'
+            )
+        return self.context['authors'][username]
+
+    def validate(self, data):
+        reviewed = (data['title'].pk, data['author'].pk)
+        if reviewed in self.context['reviewed']:
+            raise serializers.ValidationError(
+                'Нельзя оставить повторный отзыв на одно произведение'
+            )
+        self.context['reviewed'].add(reviewed)
+        return data
+
+
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
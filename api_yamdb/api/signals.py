@@ -0,0 +1,35 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, User
+from .backends import REVOKED, invalidate_user, token_versions
+from .cache import bump_version
+from .timing import record_query
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    token_versions.update(
+        instance.pk,
+        instance.token_version if instance.is_active else REVOKED,
+    )
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    token_versions.mark_deleted(instance.pk)
+
+
+@receiver(connection_created)
+def install_query_timing(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
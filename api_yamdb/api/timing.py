@@ -0,0 +1,95 @@
+import contextvars
+import threading
+import time
+
+request_timings = contextvars.ContextVar('request_timings', default=None)
+
+METRICS = ('db', 'serialize', 'render', 'total')
+
+
+class RequestTimings:
+    __slots__ = ('start', 'view_start', 'view_end', 'queries', 'db')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = None
+        self.view_end = None
+        self.queries = 0
+        self.db = 0.0
+
+    def metrics(self, end):
+        view = render = 0.0
+        if self.view_start is not None:
+            view = (self.view_end or end) - self.view_start
+        if self.view_end is not None:
+            render = end - self.view_end
+        return {
+            'db': self.db,
+            'serialize': max(view - self.db, 0.0),
+            'render': render,
+            'total': end - self.start,
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    timings = request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db += time.perf_counter() - start
+
+
+def server_timing_header(metrics, queries):
+    return ', '.join(
+        f'{name};dur={metrics[name] * 1000:.2f}'
+        + (f';desc="{queries} queries"' if name == 'db' else '')
+        for name in METRICS
+    )
+
+
+class ActionMetrics:
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, action, queries, metrics):
+        with self._lock:
+            stats = self._stats.get(action)
+            if stats is None:
+                stats = self._stats[action] = dict.fromkeys(
+                    ('requests', 'queries', *METRICS), 0
+                )
+            stats['requests'] += 1
+            stats['queries'] += queries
+            for name in METRICS:
+                stats[name] += metrics[name]
+
+    def snapshot(self):
+        with self._lock:
+            stats = {
+                action: dict(data) for action, data in self._stats.items()
+            }
+        return {
+            action: {
+                'requests': data['requests'],
+                'queries': round(data['queries'] / data['requests'], 2),
+                **{
+                    f'{name}_ms': round(
+                        data[name] * 1000 / data['requests'], 3
+                    )
+                    for name in METRICS
+                },
+            }
+            for action, data in sorted(stats.items())
+        }
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+action_metrics = ActionMetrics()
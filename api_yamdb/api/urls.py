@@ -4,7 +4,10 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CategoriesViewSet,
     CommentViewSet,
+    ExportView,
     GenresViewSet,
+    MetricsView,
+    ReviewBulkView,
     ReviewViewSet,
     SignUp,
     TitleViewSet,
@@ -32,5 +35,8 @@ router.register(
 urlpatterns = [
     path('v1/auth/signup/', SignUp.as_view()),
     path('v1/auth/token/', TokenView.as_view()),
+    path('v1/export/<str:table>/', ExportView.as_view()),
+    path('v1/metrics/', MetricsView.as_view()),
+    path('v1/reviews/bulk/', ReviewBulkView.as_view()),
     path('v1/', include(router.urls)),
 ]
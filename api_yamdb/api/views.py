@@ -1,29 +1,61 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Prefetch
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from reviews.export import (
+    CONTENT_TYPES,
+    FORMATS,
+    buffer_chunks,
+    encode_lines,
+    iterate_in_thread,
+)
 from reviews.models import Category, Genre, Review, Title, User
+from reviews.tables import TABLES_BY_NAME
+from users.models import TokenUser
+from users.outbox import enqueue_email
+from .asyncviews import AsyncReadMixin
+from .backends import token_cache, user_cache
+from .bulk import (
+    bulk_create_reviews,
+    bulk_create_titles,
+    bulk_items,
+    bulk_response_status,
+    bulk_results,
+    resolve_review_relations,
+    resolve_title_slugs,
+)
+from .cache import CachedListMixin
+from .conditional import ConditionalGetMixin
 from .filters import TitleFilter
+from .pagination import CursorOrLimitOffsetPagination
 from .permissions import IsAdmin, IsModerator, IsSuperuser, IsUser, ReadOnly
 from .serializers import (
+    SIGNUP_CONFLICT_MESSAGE,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     MeSerializer,
+    ReviewBulkSerializer,
     ReviewSerializer,
     SignUpSerializer,
+    TitleBulkSerializer,
     TitleSerializer,
     TokenSerializer,
     UserSerializer
 )
+from .timing import action_metrics
 
 
 class UserView(viewsets.ModelViewSet):
@@ -40,11 +72,14 @@ class UserView(viewsets.ModelViewSet):
     def me(self, request):
         serializer_class = MeSerializer
         if request.method == 'GET':
-            serializer = serializer_class(request._user, many=False)
+            user = request.user
+            if isinstance(user, TokenUser):
+                user = User.objects.get(pk=user.pk)
+            serializer = serializer_class(user, many=False)
             return Response(serializer.data)
 
         if request.method == 'PATCH':
-            user = User.objects.get(username=request._user)
+            user = User.objects.get(pk=request.user.pk)
             serializer = serializer_class(
                 user,
                 data=request.data,
@@ -68,20 +103,19 @@ class SignUp(APIView):
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user, created = User.objects.get_or_create(
-            username=request.data.get('username'),
-            email=request.data.get('email')
-        )
-
-        user.save()
-
-        send_mail(
-            'Confirmation code from YaMDB',
-            default_token_generator.make_token(user),
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        created = serializer.validated_data['user'] is None
+        try:
+            with transaction.atomic():
+                user = serializer.save()
+                enqueue_email(
+                    'Confirmation code from YaMDB',
+                    default_token_generator.make_token(user),
+                    user.email,
+                )
+        except IntegrityError:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [SIGNUP_CONFLICT_MESSAGE]}
+            )
 
         if created:
             return Response(
@@ -99,9 +133,10 @@ class TokenView(APIView):
         serializer.is_valid(raise_exception=True)
         username = request.data.get('username')
         confirmation_code = request.data.get('confirmation_code')
-        if not User.objects.filter(username=username).exists():
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        user = User.objects.get(username=username)
         if default_token_generator.check_token(user, confirmation_code):
             return Response(
                 {
@@ -112,6 +147,49 @@ class TokenView(APIView):
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
 
+class ExportView(APIView):
+    permission_classes = (IsAdmin | IsSuperuser,)
+
+    def get(self, request, table):
+        table = TABLES_BY_NAME.get(table)
+        if table is None:
+            raise Http404
+        export_format = request.query_params.get('type', 'csv')
+        if export_format not in FORMATS:
+            raise ValidationError({'type': [
+                f'Поддерживаемые форматы: {", ".join(FORMATS)}'
+            ]})
+        compress = request.query_params.get('compress') == 'gzip'
+        filename = f'{table.name}.{export_format}'
+        content_type = CONTENT_TYPES[export_format]
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        content = buffer_chunks(
+            encode_lines(FORMATS[export_format](table), compress)
+        )
+        if isinstance(request._request, ASGIRequest):
+            content = iterate_in_thread(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+
+class MetricsView(APIView):
+    permission_classes = (IsAdmin | IsSuperuser,)
+
+    def get(self, request):
+        return Response({
+            'actions': action_metrics.snapshot(),
+            'caches': {
+                'users': user_cache.stats(),
+                'tokens': token_cache.stats(),
+            },
+        })
+
+
 class PostDeleteListViewSet(
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -121,7 +199,7 @@ class PostDeleteListViewSet(
     pass
 
 
-class CategoriesViewSet(PostDeleteListViewSet):
+class CategoriesViewSet(CachedListMixin, PostDeleteListViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdmin | ReadOnly,)
@@ -131,7 +209,7 @@ class CategoriesViewSet(PostDeleteListViewSet):
     lookup_field = 'slug'
 
 
-class GenresViewSet(PostDeleteListViewSet):
+class GenresViewSet(CachedListMixin, PostDeleteListViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdmin | ReadOnly,)
@@ -141,9 +219,15 @@ class GenresViewSet(PostDeleteListViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')
+def modified_validators(modified):
+    return modified, modified.isoformat()
+
+
+class TitleViewSet(AsyncReadMixin, ConditionalGetMixin,
+                   viewsets.ModelViewSet):
+    replica_reads = True
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('pk'))
     )
     serializer_class = TitleSerializer
     permission_classes = (IsAdmin | ReadOnly,)
@@ -151,8 +235,46 @@ class TitleViewSet(viewsets.ModelViewSet):
     filterset_class = TitleFilter
     pagination_class = LimitOffsetPagination
 
+    def get_validators(self):
+        if self.action == 'retrieve':
+            try:
+                modified = Title.objects.filter(
+                    pk=self.kwargs['pk']
+                ).values_list('modified', flat=True).first()
+            except ValueError:
+                return None
+            return modified and modified_validators(modified)
+        state = Title.objects.aggregate(
+            modified=Max('modified'), count=Count('pk')
+        )
+        if state['modified'] is None:
+            return None
+        return (
+            state['modified'],
+            f'{state["modified"].isoformat()}:{state["count"]}',
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        items = bulk_items(request.data, settings.TITLES_BULK_LIMIT)
+        context = {
+            **self.get_serializer_context(),
+            **resolve_title_slugs(items),
+        }
+        item_serializers = [
+            TitleBulkSerializer(data=item, context=context) for item in items
+        ]
+        titles = bulk_create_titles([
+            serializer.validated_data for serializer in item_serializers
+            if serializer.is_valid()
+        ])
+        results = bulk_results(item_serializers, titles, TitleSerializer)
+        return Response(results, status=bulk_response_status(results))
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(AsyncReadMixin, ConditionalGetMixin,
+                    viewsets.ModelViewSet):
+    replica_reads = True
     serializer_class = ReviewSerializer
     permission_classes = (
         ReadOnly
@@ -161,19 +283,52 @@ class ReviewViewSet(viewsets.ModelViewSet):
         | IsModerator
         | IsUser,
     )
+    pagination_class = CursorOrLimitOffsetPagination
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
+
+    def get_validators(self):
+        return modified_validators(self.get_title().modified)
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return self.get_title().reviews.select_related('author').order_by(
+            'pub_date', 'id'
+        )
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class ReviewBulkView(APIView):
+    permission_classes = (IsAdmin | IsSuperuser,)
+
+    def post(self, request):
+        items = bulk_items(request.data, settings.REVIEWS_BULK_LIMIT)
+        context = {'request': request, **resolve_review_relations(items)}
+        item_serializers = [
+            ReviewBulkSerializer(data=item, context=context) for item in items
+        ]
+        try:
+            reviews = bulk_create_reviews([
+                serializer.validated_data for serializer in item_serializers
+                if serializer.is_valid()
+            ])
+        except IntegrityError:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Отзывы изменились во время загрузки, повторите запрос.'
+            ]})
+        results = bulk_results(item_serializers, reviews, ReviewSerializer)
+        return Response(results, status=bulk_response_status(results))
+
+
+class CommentViewSet(AsyncReadMixin, ConditionalGetMixin,
+                     viewsets.ModelViewSet):
+    replica_reads = True
     serializer_class = CommentSerializer
     permission_classes = (
         ReadOnly
@@ -182,15 +337,24 @@ class CommentViewSet(viewsets.ModelViewSet):
         | IsModerator
         | IsUser,
     )
+    pagination_class = CursorOrLimitOffsetPagination
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs.get('review_id'),
+                title=self.kwargs.get('title_id'),
+            )
+        return self._review
+
+    def get_validators(self):
+        return modified_validators(self.get_review().title.modified)
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        return review.comments.all()
+        return self.get_review().comments.select_related('author').order_by(
+            'pub_date', 'id'
+        )
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
@@ -0,0 +1,36 @@
+import contextvars
+import random
+
+from django.conf import settings
+
+read_replica = contextvars.ContextVar('read_replica', default=None)
+
+REPLICATED_APPS = ('reviews',)
+
+
+def choose_replica():
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = read_replica.get()
+        if (
+            alias in settings.DATABASE_REPLICAS
+            and model._meta.app_label in REPLICATED_APPS
+        ):
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -36,6 +38,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -64,11 +67,64 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 }
 
+# Comma-separated SQLite files refreshed from default by syncreplicas.
+# Reads of the reviews app from views with replica_reads go to one random
+# replica per request unless the client wrote within REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'api_yamdb.sqlite3',
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api_yamdb.db_routers.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = 10
+
+# Applied to every new connection by the api_yamdb.sqlite3 backend. WAL lets
+# readers run alongside a writer; busy_timeout makes writers wait for the
+# lock instead of failing.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 10000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,
+    'temp_store': 'memory',
+}
+
+# Server-Timing header with time spent in SQL, in the view outside SQL
+# (mostly serializers) and in rendering. Per-action averages are served by
+# /api/v1/metrics/.
+SERVER_TIMING = {
+    'ENABLED': True,
+    'QUERY_COUNT_HEADER': DEBUG,
+}
+
+# atomic() blocks take the write lock up front, so a transaction that reads
+# before writing waits on busy_timeout instead of failing to upgrade its lock.
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE'
+
+
+# Cache
+# LocMemCache is per process. Use a shared backend (FileBasedCache,
+# DatabaseCache) when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 
@@ -119,7 +175,6 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
         'api.backends.JWTAuthentication',
     ),
 
@@ -134,3 +189,46 @@ REST_FRAMEWORK = {
 # Constants
 
 DEFAULT_FROM_EMAIL = 'from@example.com'
+
+# Seconds before an SMTP connection or command gives up.
+EMAIL_TIMEOUT = 10
+
+# Emails are stored in users.OutgoingEmail and delivered by the sendoutbox
+# command. EMAIL_OUTBOX_EAGER=1 also tries to send each email right after
+# its transaction commits, inside the request; use it in development only.
+# A failed eager attempt leaves the email for sendoutbox.
+EMAIL_OUTBOX = {
+    'EAGER': os.getenv('EMAIL_OUTBOX_EAGER', '') == '1',
+    'BATCH_SIZE': 100,
+    'WORKERS': 4,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 30,
+    'CLAIM_TIMEOUT': 300,
+}
+
+CATALOG_CACHE_TIMEOUT = 60 * 5
+
+# Under ASGI, GET requests to titles, reviews and comments run in a bounded
+# thread pool instead of the single thread used for synchronous views.
+ASYNC_READS = {
+    'ENABLED': os.getenv('ASYNC_READS', '') == '1',
+    'WORKERS': int(os.getenv('ASYNC_READ_WORKERS', 32)),
+}
+
+TITLES_BULK_LIMIT = 500
+
+REVIEWS_BULK_LIMIT = 5000
+
+# Cached users are checked against a per-user version in CACHES, so role
+# changes and deactivations reach every worker that shares the cache. With
+# the per-process LocMemCache other workers see them only after
+# USER_CACHE_TTL seconds.
+JWT_AUTH = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
+    'USER_CACHE_SIZE': 1024,
+    'USER_CACHE_TTL': 60,
+    'ROLE_CLAIMS': False,
+    'TOKEN_VERSION_REFRESH_INTERVAL': 30,
+    'TOKEN_CACHE_SIZE': 4096,
+    'INVALID_TOKEN_CACHE_TTL': 5,
+}
@@ -0,0 +1,33 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+def apply_pragmas(connection, pragmas):
+    for name, value in pragmas.items():
+        if not PRAGMA_NAME.match(name) or not PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f'Некорректная настройка SQLITE_PRAGMAS: {name}={value!r}'
+            )
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, settings.SQLITE_PRAGMAS)
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = settings.SQLITE_TRANSACTION_MODE
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Некорректная настройка SQLITE_TRANSACTION_MODE: {mode!r}'
+            )
+        self.cursor().execute(f'BEGIN {mode}')
@@ -0,0 +1,69 @@
+import csv
+import hashlib
+import io
+import json
+from collections import deque
+
+CHUNK_SIZE = 1 << 20
+
+
+def record_boundary(data):
+    position = data.rfind(b'\n')
+    while position != -1 and data.count(b'"', 0, position) % 2:
+        position = data.rfind(b'\n', 0, position)
+    return position + 1
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, 'rb') as csv_file:
+        header = csv_file.readline()
+        tail = b''
+        while True:
+            block = csv_file.read(chunk_size)
+            if not block:
+                if tail.strip():
+                    yield header + tail
+                return
+            data = tail + block
+            boundary = record_boundary(data)
+            if boundary:
+                yield header + data[:boundary]
+            tail = data[boundary:]
+
+
+def parse_chunk(data):
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8'), newline='')))
+
+
+def bounded_map(pool, func, iterable, window):
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def read_rows(path, pool=None, window=2):
+    chunks = read_chunks(path)
+    if pool is None:
+        parsed = map(parse_chunk, chunks)
+    else:
+        parsed = bounded_map(pool, parse_chunk, chunks, window)
+    for rows in parsed:
+        yield from rows
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as csv_file:
+        for block in iter(lambda: csv_file.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def row_hash(row):
+    return hashlib.md5(
+        json.dumps(list(row.values()), ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
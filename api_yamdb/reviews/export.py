@@ -0,0 +1,122 @@
+import csv
+import gzip
+import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+DEFAULT_CHUNK_SIZE = 2000
+STREAM_BUFFER_SIZE = 64 * 1024
+GZIP_LEVEL = 6
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def export_rows(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    return table.model.objects.order_by('pk').values_list(
+        *table.columns.values()
+    ).iterator(chunk_size=chunk_size)
+
+
+def format_value(value, encoder=DjangoJSONEncoder()):
+    if value is None:
+        return ''
+    if isinstance(value, (str, int)):
+        return value
+    return encoder.default(value)
+
+
+def csv_lines(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(Echo(), lineterminator='\n')
+    yield writer.writerow(table.columns)
+    for row in export_rows(table, chunk_size):
+        yield writer.writerow([format_value(value) for value in row])
+
+
+def ndjson_lines(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    columns = tuple(table.columns)
+    for row in export_rows(table, chunk_size):
+        yield json.dumps(
+            dict(zip(columns, row)), cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+        ) + '\n'
+
+
+FORMATS = {
+    'csv': csv_lines,
+    'ndjson': ndjson_lines,
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def encode_lines(lines, compress=False):
+    if not compress:
+        for line in lines:
+            yield line.encode('utf-8')
+        return
+    compressor = zlib.compressobj(
+        GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    for line in lines:
+        data = compressor.compress(line.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def buffer_chunks(chunks, size=STREAM_BUFFER_SIZE):
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def close_in_thread(iterator):
+    try:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+    finally:
+        connection.close()
+
+
+def iterate_in_thread(iterable):
+    iterator = iter(iterable)
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            while True:
+                item = executor.submit(next, iterator, done).result()
+                if item is done:
+                    return
+                yield item
+        finally:
+            executor.submit(close_in_thread, iterator).result()
+
+
+def export_file(table, export_format, path, compress=False,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    lines = FORMATS[export_format](table, chunk_size)
+    opener = gzip.open if compress else open
+    count = -1 if export_format == 'csv' else 0
+    with opener(path, 'wt', encoding='utf-8', newline='') as export:
+        for line in lines:
+            export.write(line)
+            count += 1
+    return count
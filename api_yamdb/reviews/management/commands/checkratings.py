@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.ratings import rebuild_ratings, titles_with_rating_drift
+
+
+class Command(BaseCommand):
+    help = 'Сверяет сохранённый рейтинг произведений с отзывами'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Пересчитать рейтинг произведений с расхождениями',
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(titles_with_rating_drift())
+        for title in drifted:
+            self.stdout.write(
+                f'{title.pk} "{title.name}": '
+                f'сохранено {title.rating_sum}/{title.rating_count}, '
+                f'по отзывам {title.actual_sum}/{title.actual_count}'
+            )
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Расхождений нет'))
+            return
+        self.stdout.write(
+            self.style.WARNING(f'Расхождений найдено: {len(drifted)}')
+        )
+        if options['fix']:
+            fixed = rebuild_ratings(
+                Title.objects.filter(pk__in=[title.pk for title in drifted])
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f'Рейтинг пересчитан: {fixed}')
+            )
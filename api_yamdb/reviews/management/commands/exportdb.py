@@ -0,0 +1,70 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.export import DEFAULT_CHUNK_SIZE, FORMATS, export_file
+from reviews.tables import TABLES, TABLES_BY_NAME
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные в CSV-файлы в формате команды importdb'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            required=True,
+            help='Каталог для выгрузки',
+        )
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=tuple(FORMATS),
+            default='csv',
+            help='Формат файлов',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы gzip',
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=tuple(TABLES_BY_NAME),
+            help='Выгрузить только перечисленные таблицы',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['path'], exist_ok=True)
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должно быть не меньше 1')
+        tables = [
+            table for table in TABLES
+            if not options['tables'] or table.name in options['tables']
+        ]
+        extension = options['export_format']
+        if options['gzip']:
+            extension += '.gz'
+        for table in tables:
+            path = os.path.join(options['path'], f'{table.name}.{extension}')
+            start = time.perf_counter()
+            count = export_file(
+                table,
+                options['export_format'],
+                path,
+                options['gzip'],
+                options['chunk_size'],
+            )
+            elapsed = time.perf_counter() - start
+            rate = count / elapsed if elapsed else 0
+            self.stdout.write(self.style.SUCCESS(
+                f'{os.path.basename(path)}: выгружено {count} строк '
+                f'за {elapsed:.2f} с ({rate:,.0f} строк/с)'
+            ))
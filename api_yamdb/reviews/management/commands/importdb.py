@@ -1,138 +1,448 @@
-import csv
+import json
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from itertools import islice
+from queue import Full, Queue
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.shortcuts import get_object_or_404
-
-from reviews.models import (
-    User,
-    Category,
-    Genre,
-    Title,
-    Comment,
-    Review,
-    TitleGenre,
-)
-
-USERS = 'users.csv'
-CATEGORY = 'category.csv'
-GENRE = 'genre.csv'
-TITLE = 'titles.csv'
-GENRE_TITLE = 'genre_title.csv'
-COMMENTS = 'comments.csv'
-REVIEW = 'review.csv'
-
-
-def get_reader(file):
-    csv_path = os.path.join(settings.BASE_DIR, 'static/data/', file)
-    csv_file = open(csv_path, encoding='utf-8')
-    reader = csv.DictReader(csv_file, delimiter=',')
-    return reader
-
-
-def import_users():
-    csv_reader = get_reader(USERS)
-    for row in csv_reader:
-        obj, created = User.objects.get_or_create(
-            id=row['id'],
-            username=row['username'],
-            email=row['email'],
-            role=row['role'],
-            bio=row['bio'],
-            first_name=row['first_name'],
-            last_name=row['last_name'],
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.backends import invalidate_user
+from api.cache import bump_version
+from reviews.csvio import file_checksum, read_rows, row_hash
+from reviews.models import Title
+from reviews.ratings import rebuild_ratings
+from reviews.tables import TABLES, TABLES_BY_NAME
+
+DEFAULT_PATH = os.path.join(settings.BASE_DIR, 'static/data/')
+DEFAULT_BATCH_SIZE = 1000
+READ_AHEAD_BATCHES = 10
+MANIFEST_FILE = '.importdb-manifest.json'
+RATING_TABLES = {'review'}
+RENDERED_TABLES = {'users', 'category', 'genre', 'genre_title', 'comments'}
+CACHED_TABLES = {'category', 'genre'}
+AUTH_TABLES = {'users'}
+
+
+def load_ids(table_name, known_ids):
+    if table_name not in known_ids:
+        known_ids[table_name] = set(
+            TABLES_BY_NAME[table_name].model.objects.values_list(
+                'pk', flat=True
+            )
+        )
+    return known_ids[table_name]
+
+
+def dependency_levels(tables):
+    levels = []
+    loaded = set()
+    remaining = list(tables)
+    while remaining:
+        level = [
+            table for table in remaining if table.dependencies <= loaded
+        ]
+        if not level:
+            raise CommandError(
+                'Циклическая зависимость между таблицами: '
+                + ', '.join(table.name for table in remaining)
+            )
+        levels.append(level)
+        loaded.update(table.name for table in level)
+        remaining = [table for table in remaining if table not in level]
+    return levels
+
+
+def read_batches(path, batch_size, pool=None):
+    rows = read_rows(path, pool)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class ReadAhead:
+    done = object()
+
+    def __init__(self, batches, size):
+        self.batches = batches
+        self.queue = Queue(maxsize=size)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.produce, daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce(self):
+        try:
+            for batch in self.batches:
+                if not self.put(batch):
+                    return
+        except BaseException as error:
+            self.put(error)
+        else:
+            self.put(self.done)
+        finally:
+            self.batches.close()
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is self.done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self):
+        self.stop.set()
+        self.thread.join()
+
+
+def locked_batches(path, batch_size, pool, lock):
+    batches = read_batches(path, batch_size, pool)
+    if lock is None:
+        return batches
+    return ReadAhead(batches, READ_AHEAD_BATCHES)
+
+
+@contextmanager
+def source_dates(model):
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield [field.attname for field in fields]
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def insert_rows(model, objs, batch_size):
+    with source_dates(model) as created:
+        now = timezone.now()
+        for obj in objs:
+            for field in created:
+                if getattr(obj, field) in (None, ''):
+                    setattr(obj, field, now)
+        model.objects.bulk_create(
+            objs, batch_size=batch_size, ignore_conflicts=True
         )
-    print(f'{USERS} успешно импортировалось!')
 
 
-def import_category():
-    csv_reader = get_reader(CATEGORY)
-    for row in csv_reader:
-        obj, created = Category.objects.get_or_create(
-            id=row['id'],
-            name=row['name'],
-            slug=row['slug'],
+def invalidate_users(ids):
+    for user_id in ids:
+        invalidate_user(user_id)
+
+
+def update_users(model, users, fields, batch_size):
+    if not users:
+        return
+    ids = [user.pk for user in users]
+    roles = dict(model.objects.filter(pk__in=ids).values_list('pk', 'role'))
+    model.objects.bulk_update(users, fields, batch_size=batch_size)
+    model.objects.filter(pk__in=[
+        user.pk for user in users if roles.get(user.pk) != user.role
+    ]).update(token_version=F('token_version') + 1)
+    transaction.on_commit(lambda: invalidate_users(ids))
+
+
+def import_table(table, path, known_ids, batch_size, pool=None,
+                 lock=None):
+    for dependency in table.dependencies:
+        load_ids(dependency, known_ids)
+    stats = Counter()
+    batches = locked_batches(path, batch_size, pool, lock)
+    with closing(batches), lock or nullcontext(), transaction.atomic():
+        count = table.model.objects.count()
+        for rows in batches:
+            objs = [
+                obj for obj in (table.build(row, known_ids) for row in rows)
+                if obj is not None
+            ]
+            insert_rows(table.model, objs, batch_size)
+            stats['conflicts'] += len(objs)
+            stats['skipped'] += len(rows) - len(objs)
+        stats['inserted'] = table.model.objects.count() - count
+        stats['conflicts'] -= stats['inserted']
+    return stats
+
+
+def update_rows(table, objs, fields, batch_size):
+    model = table.model
+    auto_now = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+    ]
+    now = timezone.now()
+    for obj in objs:
+        for field in auto_now:
+            setattr(obj, field, now)
+    if table.name in AUTH_TABLES:
+        update_users(model, objs, fields + auto_now, batch_size)
+    else:
+        model.objects.bulk_update(
+            objs, fields + auto_now, batch_size=batch_size
         )
-    print(f'{CATEGORY} успешно импортировалось!')
 
 
-def import_genre():
-    csv_reader = get_reader(GENRE)
-    for row in csv_reader:
-        obj, created = Genre.objects.get_or_create(
-            id=row['id'],
-            name=row['name'],
-            slug=row['slug'],
+def upsert_table(table, path, known_ids, batch_size, state, delete=False,
+                 pool=None, lock=None):
+    for dependency in table.dependencies:
+        load_ids(dependency, known_ids)
+    model = table.model
+    pk = model._meta.pk
+    pk_column, = (
+        column for column, field in table.columns.items()
+        if field == pk.attname
+    )
+    fields = [
+        field for field in table.columns.values() if field != pk.attname
+    ]
+    hashes = state.get('rows', {})
+    new_hashes = {}
+    source_ids = set()
+    stats = Counter()
+    batches = locked_batches(path, batch_size, pool, lock)
+    with closing(batches), lock or nullcontext(), transaction.atomic():
+        existing = set(model.objects.values_list('pk', flat=True))
+        for rows in batches:
+            inserts, updates = [], []
+            for row in rows:
+                source_ids.add(pk.to_python(row[pk_column]))
+                obj = table.build(row, known_ids)
+                if obj is None:
+                    stats['skipped'] += 1
+                    continue
+                obj.pk = pk.to_python(obj.pk)
+                digest = new_hashes[str(obj.pk)] = row_hash(row)
+                if obj.pk not in existing:
+                    inserts.append(obj)
+                elif hashes.get(str(obj.pk)) != digest:
+                    updates.append(obj)
+                else:
+                    stats['unchanged'] += 1
+            insert_rows(model, inserts, batch_size)
+            update_rows(table, updates, fields, batch_size)
+            stats['conflicts'] += len(inserts)
+            stats['updated'] += len(updates)
+        stats['inserted'] = model.objects.count() - len(existing)
+        stats['conflicts'] -= stats['inserted']
+        if delete:
+            stats['deleted'] = delete_missing(
+                model, existing - source_ids, batch_size
+            )
+    return stats, new_hashes
+
+
+def delete_missing(model, ids, batch_size):
+    ids = sorted(ids)
+    for start in range(0, len(ids), batch_size):
+        model.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+    return len(ids)
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(path, manifest):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temporary, path)
+
+
+def run_in_thread(func, *args):
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Импортирует данные из CSV-файлов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_PATH,
+            help='Каталог с CSV-файлами',
         )
-    print(f'{GENRE} успешно импортировалось!')
-
-
-def import_title():
-    csv_reader = get_reader(TITLE)
-    for row in csv_reader:
-        obj_category = get_object_or_404(Category, id=row['category'])
-        obj, created = Title.objects.get_or_create(
-            id=row['id'],
-            name=row['name'],
-            year=row['year'],
-            category=obj_category,
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT',
         )
-    print(f'{TITLE} успешно импортировалось!')
-
-
-def import_genre_title():
-    csv_reader = get_reader(GENRE_TITLE)
-    for row in csv_reader:
-        obj_genre = get_object_or_404(Genre, id=row['genre'])
-        obj_title = get_object_or_404(Title, id=row['title'])
-        obj, created = TitleGenre.objects.get_or_create(
-            id=row['id'],
-            genre=obj_genre,
-            title=obj_title,
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Количество процессов разбора CSV и таблиц, '
+                 'загружаемых одновременно',
         )
-    print(f'{GENRE_TITLE} успешно импортировалось!')
-
-
-def import_comments():
-    csv_reader = get_reader(COMMENTS)
-    for row in csv_reader:
-        obj_review = get_object_or_404(Review, id=row['review_id'])
-        obj_author = get_object_or_404(User, id=row['author'])
-        obj, created = Comment.objects.get_or_create(
-            id=row['id'],
-            review=obj_review,
-            text=row['text'],
-            author=obj_author,
-            pub_date=row['pub_date'],
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Пропускать неизменённые файлы и строки, обновлять '
+                 'изменённые',
         )
-    print(f'{COMMENTS} успешно импортировалось!')
-
-
-def import_review():
-    csv_reader = get_reader('review.csv')
-    for row in csv_reader:
-        obj_title = get_object_or_404(Title, id=row['title_id'])
-        obj_author = get_object_or_404(User, id=row['author'])
-        obj, created = Review.objects.get_or_create(
-            id=row['id'],
-            title=obj_title,
-            text=row['text'],
-            author=obj_author,
-            score=row['score'],
-            pub_date=row['pub_date'],
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='В режиме --incremental удалять строки, которых нет в '
+                 'CSV-файлах',
+        )
+        parser.add_argument(
+            '--manifest',
+            help='Файл с контрольными суммами для режима --incremental, '
+                 f'по умолчанию {MANIFEST_FILE} в каталоге --path',
         )
-    print(f'{REVIEW} успешно импортировалось!')
-
 
-class Command(BaseCommand):
     def handle(self, *args, **options):
-        try:
-            import_users()
-            import_category()
-            import_genre()
-            import_title()
-            import_review()
-            import_comments()
-        except Exception as error:
-            print(f'Ошибка импорта {error}')
+        if not os.path.isdir(options['path']):
+            raise CommandError(f'Каталог {options["path"]} не найден')
+        if options['jobs'] < 1:
+            raise CommandError('--jobs должно быть не меньше 1')
+        if options['delete'] and not options['incremental']:
+            raise CommandError('--delete работает только с --incremental')
+        self.options = options
+        self.known_ids = {}
+        self.changed_tables = set()
+        self.deleted_tables = set()
+        manifest_path = options['manifest'] or os.path.join(
+            options['path'], MANIFEST_FILE
+        )
+        self.manifest = (
+            load_manifest(manifest_path) if options['incremental'] else {}
+        )
+        if options['jobs'] == 1:
+            self.import_levels()
+        else:
+            with ProcessPoolExecutor(options['jobs']) as pool, \
+                    ThreadPoolExecutor(options['jobs']) as threads:
+                self.import_levels(pool, threads)
+        if options['incremental']:
+            save_manifest(manifest_path, self.manifest)
+        if self.changed_tables & RATING_TABLES:
+            rebuild_ratings()
+        elif self.changed_tables & RENDERED_TABLES:
+            Title.objects.update(modified=timezone.now())
+        for table_name in self.changed_tables & CACHED_TABLES:
+            bump_version(TABLES_BY_NAME[table_name].model._meta.label_lower)
+
+    def import_levels(self, pool=None, threads=None):
+        lock = None
+        if threads is not None and connection.vendor == 'sqlite':
+            lock = threading.Lock()
+        for level in dependency_levels(TABLES):
+            for table in level:
+                for dependency in table.dependencies:
+                    load_ids(dependency, self.known_ids)
+            files = self.existing_files(level, self.options['path'])
+            if threads is None:
+                results = [
+                    self.import_file(*file, pool, lock) for file in files
+                ]
+            else:
+                results = threads.map(
+                    lambda file: run_in_thread(
+                        self.import_file, *file, pool, lock
+                    ),
+                    files,
+                )
+            for (table, _), (stats, elapsed) in zip(files, results):
+                self.report(table, stats, elapsed)
+                self.known_ids.pop(table.name, None)
+                if stats['inserted'] or stats['updated'] or stats['deleted']:
+                    self.changed_tables.add(table.name)
+                if stats['deleted']:
+                    self.deleted_tables.add(table.name)
+
+    def existing_files(self, tables, directory):
+        files = []
+        for table in tables:
+            path = os.path.join(directory, table.file)
+            if os.path.exists(path):
+                files.append((table, path))
+            else:
+                self.stdout.write(
+                    self.style.WARNING(f'{table.file} не найден, пропущен')
+                )
+        return files
+
+    def import_file(self, table, path, pool, lock):
+        start = time.perf_counter()
+        batch_size = self.options['batch_size']
+        if not self.options['incremental']:
+            stats = import_table(
+                table, path, self.known_ids, batch_size, pool, lock
+            )
+            return stats, time.perf_counter() - start
+        checksum = file_checksum(path)
+        state = self.manifest.get(table.name, {})
+        if (
+            state.get('checksum') == checksum
+            and not table.dependencies & self.deleted_tables
+        ):
+            return Counter(unchanged=len(state['rows'])), None
+        stats, hashes = upsert_table(
+            table, path, self.known_ids, batch_size, state,
+            self.options['delete'], pool, lock,
+        )
+        self.manifest[table.name] = {'checksum': checksum, 'rows': hashes}
+        return stats, time.perf_counter() - start
+
+    def report(self, table, stats, elapsed):
+        if elapsed is None:
+            self.stdout.write(
+                self.style.SUCCESS(f'{table.file} не изменился, пропущен')
+            )
+            return
+        rate = sum(stats.values()) / elapsed if elapsed else 0
+        timing = f'за {elapsed:.2f} с ({rate:,.0f} строк/с)'
+        if not self.options['incremental']:
+            message = (
+                f'{table.file} успешно импортировалось: '
+                f'{stats["inserted"]} строк {timing}'
+            )
+        else:
+            message = (
+                f'{table.file}: добавлено {stats["inserted"]}, '
+                f'обновлено {stats["updated"]}, '
+                f'удалено {stats["deleted"]}, '
+                f'без изменений {stats["unchanged"]} {timing}'
+            )
+        self.stdout.write(self.style.SUCCESS(message))
+        if stats['skipped']:
+            self.stdout.write(self.style.WARNING(
+                f'{table.file}: пропущено строк с несуществующими '
+                f'связями: {stats["skipped"]}'
+            ))
+        if stats['conflicts']:
+            self.stdout.write(self.style.WARNING(
+                f'{table.file}: пропущено строк, конфликтующих с '
+                f'существующими: {stats["conflicts"]}'
+            ))
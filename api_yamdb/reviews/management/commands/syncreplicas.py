@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def copy_database(source, path):
+    temporary = f'{path}.tmp'
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    with closing(sqlite3.connect(temporary)) as target:
+        source.backup(target)
+    os.replace(temporary, path)
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в файлы реплик'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--replicas',
+            nargs='+',
+            help='Обновить только перечисленные реплики',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять копирование с заданным интервалом в секундах, '
+                 'не завершая работу',
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['replicas'] or settings.DATABASE_REPLICAS
+        unknown = set(aliases) - set(settings.DATABASE_REPLICAS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные реплики: {", ".join(sorted(unknown))}'
+            )
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('Копирование реплик работает только с SQLite')
+        while True:
+            primary.ensure_connection()
+            for alias in aliases:
+                start = time.perf_counter()
+                replica = connections[alias]
+                replica.close()
+                copy_database(
+                    primary.connection, replica.settings_dict['NAME']
+                )
+                self.stdout.write(self.style.SUCCESS(
+                    f'{alias}: {time.perf_counter() - start:.2f} с'
+                ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
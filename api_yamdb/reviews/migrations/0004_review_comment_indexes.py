@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 18:29
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_title_genres(apps, schema_editor):
+    TitleGenre = apps.get_model('reviews', 'TitleGenre')
+    keep = TitleGenre.objects.values('title', 'genre').annotate(
+        keep_id=Min('id')
+    ).values('keep_id')
+    TitleGenre.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date', 'id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlegenre',
+            index=models.Index(fields=['genre', 'title'], name='titlegenre_genre_title_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_title_genres, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='titlegenre',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
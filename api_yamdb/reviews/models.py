@@ -3,7 +3,7 @@ from django.core.validators import (
     MinValueValidator,
 )
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from users.models import User
@@ -54,6 +54,21 @@ class Title(models.Model):
         blank=True,
         null=True,
     )
+    rating_sum = models.IntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.IntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
 
     class Meta:
         ordering = ['-year']
@@ -66,6 +81,12 @@ class Title(models.Model):
         if self.year > now:
             raise ValidationError(f'Год релиза не может быть больше {now}')
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum // self.rating_count
+
     def __str__(self):
         return self.name
 
@@ -85,6 +106,18 @@ class TitleGenre(models.Model):
     class Meta:
         verbose_name = 'Жанры произведения'
         verbose_name_plural = 'Жанры произведения'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_title_genre',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='titlegenre_genre_title_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'Произведение:"{self.title}". Жанр:{self.genre}'
@@ -123,6 +156,23 @@ class Review(models.Model):
                 name='unique_review',
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'title_id', 'score'} <= set(field_names):
+            instance._rating_snapshot = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(models.Model):
@@ -145,3 +195,9 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
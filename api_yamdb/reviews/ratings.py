@@ -0,0 +1,44 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Review, Title
+
+
+def apply_rating_delta(title_id, score_delta, count_delta):
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        modified=timezone.now(),
+    )
+
+
+def titles_with_rating_drift(queryset=None):
+    if queryset is None:
+        queryset = Title.objects.all()
+    return queryset.order_by('pk').annotate(
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+        actual_count=Count('reviews'),
+    ).filter(
+        ~Q(rating_sum=F('actual_sum'))
+        | ~Q(rating_count=F('actual_count'))
+    )
+
+
+def rebuild_ratings(queryset=None):
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return queryset.update(
+        modified=timezone.now(),
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+        ),
+    )
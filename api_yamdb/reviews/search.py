@@ -0,0 +1,92 @@
+import re
+
+from django.db import connections
+
+from .models import Title
+
+TITLE_TABLE = Title._meta.db_table
+FTS_TABLE = f'{TITLE_TABLE}_fts'
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+        AFTER INSERT ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+    f'{FTS_TABLE}_ad': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+        AFTER DELETE ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    ''',
+    f'{FTS_TABLE}_au': f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+}
+TOKEN_RE = re.compile(r'\w+')
+
+_fts_support = {}
+
+
+def fts_supported(connection):
+    if connection.alias not in _fts_support:
+        supported = False
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA compile_options')
+                supported = ('ENABLE_FTS5',) in cursor.fetchall()
+        _fts_support[connection.alias] = supported
+    return _fts_support[connection.alias]
+
+
+def install_title_search(connection):
+    if not fts_supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = %s",
+            [TITLE_TABLE],
+        )
+        existing = {name for name, in cursor.fetchall()}
+        if existing >= FTS_TRIGGERS.keys():
+            return False
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f"name, description, content='{TITLE_TABLE}', "
+            "content_rowid='id')"
+        )
+        for sql in FTS_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+    return True
+
+
+def match_expression(value):
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(value))
+
+
+def search_titles(queryset, value):
+    expression = match_expression(value)
+    if not expression or not fts_supported(connections[queryset.db]):
+        return queryset.filter(name__icontains=value)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[expression],
+        select={'search_rank': f'bm25({FTS_TABLE})'},
+        order_by=['search_rank', 'id'],
+    )
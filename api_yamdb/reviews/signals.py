@@ -0,0 +1,80 @@
+from django.db import connections
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Category, Comment, Genre, Review, Title, User
+from .ratings import apply_rating_delta, rebuild_ratings
+from .search import install_title_search
+
+
+def touch_titles(**lookups):
+    Title.objects.filter(**lookups).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_title_id, old_score = getattr(
+        instance, '_rating_snapshot', (None, None)
+    )
+    if created:
+        apply_rating_delta(instance.title_id, instance.score, 1)
+    elif old_title_id is None:
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    elif old_title_id != instance.title_id:
+        apply_rating_delta(old_title_id, -old_score, -1)
+        apply_rating_delta(instance.title_id, instance.score, 1)
+    elif old_score != instance.score:
+        apply_rating_delta(instance.title_id, instance.score - old_score, 0)
+    else:
+        touch_titles(pk=instance.title_id)
+    instance._rating_snapshot = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    title_id, score = getattr(
+        instance, '_rating_snapshot', (instance.title_id, instance.score)
+    )
+    apply_rating_delta(title_id, -score, -1)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def touch_title_on_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(reviews=instance.review_id)
+
+
+@receiver((post_save, pre_delete), sender=Category)
+def touch_titles_on_category(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(category=instance)
+
+
+@receiver((post_save, pre_delete), sender=Genre)
+def touch_titles_on_genre(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(genre=instance)
+
+
+@receiver(post_save, sender=User)
+def touch_titles_on_username(sender, instance, created, raw=False, **kwargs):
+    old_username = getattr(instance, '_username_snapshot', None)
+    instance._username_snapshot = instance.username
+    if raw or created or old_username in (None, instance.username):
+        return
+    touch_titles(reviews__author=instance)
+    touch_titles(reviews__comments__author=instance)
+
+
+@receiver(post_migrate)
+def install_search_index(sender, using, **kwargs):
+    if sender.name == 'reviews':
+        install_title_search(connections[using])
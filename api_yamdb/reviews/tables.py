@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+from .models import Category, Comment, Genre, Review, Title, TitleGenre, User
+
+
+class Table(namedtuple(
+    'Table', ('name', 'model', 'columns', 'foreign_keys')
+)):
+    __slots__ = ()
+
+    @property
+    def file(self):
+        return f'{self.name}.csv'
+
+    @property
+    def dependencies(self):
+        return set(self.foreign_keys.values())
+
+    def build(self, row, known_ids):
+        values = {}
+        for column, field in self.columns.items():
+            value = row[column]
+            if column in self.foreign_keys:
+                if value == '':
+                    if not self.model._meta.get_field(field).null:
+                        return None
+                    value = None
+                else:
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        return None
+                    if value not in known_ids[self.foreign_keys[column]]:
+                        return None
+            values[field] = value
+        return self.model(**values)
+
+
+TABLES = (
+    Table('users', User, {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'role': 'role',
+        'bio': 'bio',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }, {}),
+    Table('category', Category, {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+    }, {}),
+    Table('genre', Genre, {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+    }, {}),
+    Table('titles', Title, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'category': 'category_id',
+    }, {'category': 'category'}),
+    Table('genre_title', TitleGenre, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'genre_id': 'genre_id',
+    }, {'title_id': 'titles', 'genre_id': 'genre'}),
+    Table('review', Review, {
+        'id': 'id',
+        'title_id': 'title_id',
+        'text': 'text',
+        'author': 'author_id',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }, {'title_id': 'titles', 'author': 'users'}),
+    Table('comments', Comment, {
+        'id': 'id',
+        'review_id': 'review_id',
+        'text': 'text',
+        'author': 'author_id',
+        'pub_date': 'pub_date',
+    }, {'review_id': 'review', 'author': 'users'}),
+)
+
+TABLES_BY_NAME = {table.name: table for table in TABLES}
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.models import OutgoingEmail
+from users.outbox import drain
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящей почты'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Количество потоков отправки',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество писем, забираемых потоком за один раз',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Опрашивать очередь с заданным интервалом в секундах, '
+                 'не завершая работу',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent = drain(options['batch_size'], options['workers'])
+                pending = OutgoingEmail.objects.filter(
+                    status=OutgoingEmail.PENDING
+                ).count()
+            except Exception as error:
+                if not options['interval']:
+                    raise
+                self.stderr.write(f'Ошибка отправки писем: {error!r}')
+            else:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, в очереди: {pending}'
+                )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedUser',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='User id')),
+                ('deleted_at', models.DateTimeField(db_index=True, verbose_name='Deleted at')),
+            ],
+        ),
+    ]
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import jwt
 from django.conf import settings
@@ -73,6 +73,11 @@ class User(PermissionsMixin, AbstractBaseUser):
     is_active = models.BooleanField(default=True)
     is_admin = models.BooleanField(default=False)
 
+    token_version = models.PositiveIntegerField(
+        'Token version',
+        default=0,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     updated_at = models.DateTimeField(auto_now=True)
@@ -88,6 +93,25 @@ class User(PermissionsMixin, AbstractBaseUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'role', 'is_active'} <= set(field_names):
+            instance._auth_snapshot = (instance.role, instance.is_active)
+        if 'username' in field_names:
+            instance._username_snapshot = instance.username
+        return instance
+
+    def save(self, *args, **kwargs):
+        snapshot = getattr(self, '_auth_snapshot', None)
+        if snapshot is not None and snapshot != (self.role, self.is_active):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._auth_snapshot = (self.role, self.is_active)
+
     def has_perm(self, perm, obj=None):
         return True
 
@@ -120,14 +144,97 @@ class User(PermissionsMixin, AbstractBaseUser):
 
     def _generate_jwt_token(self):
         dt = datetime.now()
-        td = timedelta(days=1)
-        payload = self.pk
+        td = settings.JWT_AUTH['ACCESS_TOKEN_LIFETIME']
+        payload = {
+            'user_id': self.pk,
+            'exp': int((dt + td).timestamp()),
+        }
+        if settings.JWT_AUTH['ROLE_CLAIMS']:
+            payload.update(
+                username=self.username,
+                role=self.role,
+                is_active=self.is_active,
+                token_version=self.token_version,
+            )
         token = jwt.encode(
-            {
-                'user_id': payload,
-                'exp': int((dt + td).timestamp()),
-            },
+            payload,
             settings.SECRET_KEY,
             algorithm='HS256',
         )
         return token
+
+
+class TokenUser(User):
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_payload(cls, payload):
+        user = cls(
+            pk=payload['user_id'],
+            username=payload['username'],
+            role=payload['role'],
+            is_active=payload['is_active'],
+            token_version=payload['token_version'],
+        )
+        user._state.adding = False
+        return user
+
+    def save(self, *args, **kwargs):
+        raise TypeError(
+            'TokenUser построен по токену, загрузите пользователя из базы'
+        )
+
+    def delete(self, *args, **kwargs):
+        raise TypeError(
+            'TokenUser построен по токену, загрузите пользователя из базы'
+        )
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не удалось отправить'),
+    )
+
+    subject = models.CharField('Subject', max_length=255)
+    body = models.TextField('Body')
+    from_email = models.CharField('From', max_length=254)
+    to_email = models.EmailField('To', max_length=254)
+    status = models.CharField(
+        'Status',
+        max_length=10,
+        default=PENDING,
+        choices=STATUS_CHOICES,
+    )
+    attempts = models.PositiveSmallIntegerField('Attempts', default=0)
+    next_attempt_at = models.DateTimeField('Next attempt at')
+    claim = models.UUIDField('Claim', null=True, blank=True)
+    last_error = models.TextField('Last error', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField('Sent at', null=True, blank=True)
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoingemail_due_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to_email}: {self.subject}'
+
+
+class DeletedUser(models.Model):
+    user_id = models.BigIntegerField('User id', primary_key=True)
+    deleted_at = models.DateTimeField('Deleted at', db_index=True)
+
+    def __str__(self):
+        return f'{self.user_id}: {self.deleted_at}'
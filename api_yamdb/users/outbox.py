@@ -0,0 +1,153 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, to_email, from_email=None):
+    config = settings.EMAIL_OUTBOX
+    next_attempt_at = timezone.now()
+    if config['EAGER']:
+        next_attempt_at += timedelta(seconds=config['CLAIM_TIMEOUT'])
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to_email=to_email,
+        next_attempt_at=next_attempt_at,
+    )
+    if config['EAGER']:
+        transaction.on_commit(lambda: deliver_now(email))
+    return email
+
+
+def deliver_now(email):
+    try:
+        deliver([email])
+    except Exception:
+        logger.exception(
+            'Письмо %s оставлено в очереди для sendoutbox', email.pk
+        )
+
+
+def claim_batch(size):
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING, next_attempt_at__lte=now
+    )
+    ids = list(due.values_list('pk', flat=True)[:size])
+    if not ids:
+        return []
+    claim = uuid.uuid4()
+    due.filter(pk__in=ids).update(
+        claim=claim,
+        next_attempt_at=now + timedelta(
+            seconds=settings.EMAIL_OUTBOX['CLAIM_TIMEOUT']
+        ),
+    )
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def schedule_retry(email, error):
+    config = settings.EMAIL_OUTBOX
+    attempts = email.attempts + 1
+    fields = {
+        'attempts': attempts,
+        'claim': None,
+        'last_error': str(error) or repr(error),
+    }
+    if attempts >= config['MAX_ATTEMPTS']:
+        fields['status'] = OutgoingEmail.FAILED
+    else:
+        fields['next_attempt_at'] = timezone.now() + timedelta(
+            seconds=config['RETRY_BACKOFF'] * 2 ** (attempts - 1)
+        )
+    OutgoingEmail.objects.filter(pk=email.pk).update(**fields)
+
+
+def mark_sent(pks, lock):
+    if not pks:
+        return
+    with lock or nullcontext():
+        OutgoingEmail.objects.filter(pk__in=pks).update(
+            status=OutgoingEmail.SENT,
+            sent_at=timezone.now(),
+            claim=None,
+            last_error='',
+        )
+
+
+def deliver(emails, connection=None, lock=None):
+    pending, sent = list(emails), []
+    own_connection = connection is None
+    try:
+        if own_connection:
+            connection = get_connection()
+        connection.open()
+        while pending:
+            email = pending.pop(0)
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                [email.to_email],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                with lock or nullcontext():
+                    schedule_retry(email, error)
+                connection.close()
+                connection.open()
+            else:
+                sent.append(email.pk)
+    except Exception as error:
+        with lock or nullcontext():
+            for email in pending:
+                schedule_retry(email, error)
+    finally:
+        mark_sent(sent, lock)
+        if own_connection and connection is not None:
+            connection.close()
+    return len(sent)
+
+
+def drain_worker(batch_size, lock):
+    sent = 0
+    connection = get_connection()
+    try:
+        while True:
+            with lock or nullcontext():
+                batch = claim_batch(batch_size)
+            if not batch:
+                return sent
+            sent += deliver(batch, connection, lock)
+    finally:
+        connection.close()
+        db_connection.close()
+
+
+def drain(batch_size=None, workers=None):
+    config = settings.EMAIL_OUTBOX
+    batch_size = batch_size or config['BATCH_SIZE']
+    workers = workers or config['WORKERS']
+    lock = threading.Lock() if db_connection.vendor == 'sqlite' else None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(drain_worker, batch_size, lock)
+            for _ in range(workers)
+        ]
+    return sum(future.result() for future in futures)
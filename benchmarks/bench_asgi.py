@@ -0,0 +1,205 @@
+"""Пропускная способность чтения под WSGI и ASGI.
+
+Гоняет GET-запросы к произведениям и отзывам в процессе, без сети:
+WSGI - пул из --threads потоков (как gunicorn gthread), ASGI - цикл
+событий с синхронными представлениями и с ASYNC_READS. --client-delay
+имитирует медленного клиента при отправке тела ответа, --query-delay -
+задержку сети до базы данных.
+
+    python benchmarks/bench_asgi.py [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import importlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import report, setup_django
+
+
+def seed(titles, reviews):
+    from reviews.models import Category, Genre, Review, Title, TitleGenre
+    from reviews.ratings import rebuild_ratings
+    from users.models import User
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {n}', year=2000, category=category)
+        for n in range(titles)
+    )
+    title_ids = list(Title.objects.values_list('pk', flat=True))
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title_id=pk, genre=genre) for pk in title_ids
+    )
+    User.objects.bulk_create(
+        User(username=f'bench{n}', email=f'bench{n}@ya.fake')
+        for n in range(reviews)
+    )
+    Review.objects.bulk_create(
+        Review(title_id=pk, author=author, text='Отзыв', score=5)
+        for pk in title_ids
+        for author in User.objects.all()[:reviews]
+    )
+    rebuild_ratings()
+    return title_ids
+
+
+def reload_urls():
+    from django.urls import clear_url_caches
+
+    import api.urls
+    import api_yamdb.urls
+    importlib.reload(api.urls)
+    importlib.reload(api_yamdb.urls)
+    clear_url_caches()
+
+
+def wsgi_environ(path):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.url_scheme': 'http',
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def run_wsgi(paths, threads, client_delay):
+    from django.core.handlers.wsgi import WSGIHandler
+    application = WSGIHandler()
+    statuses = []
+
+    def request(path):
+        body = application(wsgi_environ(path), lambda status, headers: (
+            statuses.append(int(status.split()[0]))
+        ))
+        for _ in body:
+            if client_delay:
+                time.sleep(client_delay)
+        body.close()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(request, paths))
+    return statuses
+
+
+async def asgi_request(application, path, client_delay):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif client_delay:
+            await asyncio.sleep(client_delay)
+
+    await application(scope, receive, send)
+    return status
+
+
+def run_asgi(paths, concurrency, client_delay):
+    from django.core.handlers.asgi import ASGIHandler
+    application = ASGIHandler()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(path):
+            async with semaphore:
+                return await asgi_request(application, path, client_delay)
+
+        return await asyncio.gather(*map(request, paths))
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--titles', type=int, default=50)
+    parser.add_argument('--reviews', type=int, default=10)
+    parser.add_argument('--client-delay', type=float, default=0.5)
+    parser.add_argument('--query-delay', type=float, default=0.005)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db.backends.signals import connection_created
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(args.query_delay)
+        return execute(sql, params, many, context)
+
+    def add_delay(connection, **kwargs):
+        connection.execute_wrappers.append(slow_query)
+
+    title_ids = seed(args.titles, args.reviews)
+    if args.query_delay:
+        from django.db import connection
+        connection.execute_wrappers.append(slow_query)
+        connection_created.connect(add_delay)
+    paths = [
+        f'/api/v1/titles/{pk}/reviews/' if n % 2 else f'/api/v1/titles/{pk}/'
+        for n, pk in enumerate(
+            title_ids[n % len(title_ids)] for n in range(args.requests)
+        )
+    ]
+
+    def timed(func, *func_args):
+        start = time.perf_counter()
+        statuses = func(*func_args)
+        elapsed = time.perf_counter() - start
+        assert set(statuses) == {200}, set(statuses)
+        return len(statuses) / elapsed
+
+    print(
+        f'{args.requests} запросов, {args.concurrency} соединений, '
+        f'клиент {args.client_delay}s, запрос к БД {args.query_delay}s'
+    )
+    baseline = timed(run_wsgi, paths, args.threads, args.client_delay)
+    report(f'WSGI, {args.threads} потоков', baseline)
+    settings.ASYNC_READS = {'ENABLED': False, 'WORKERS': args.workers}
+    reload_urls()
+    report('ASGI, синхронные представления', timed(
+        run_asgi, paths, args.concurrency, args.client_delay
+    ), baseline)
+    settings.ASYNC_READS = {'ENABLED': True, 'WORKERS': args.workers}
+    reload_urls()
+    report(f'ASGI, ASYNC_READS, {args.workers} потоков', timed(
+        run_asgi, paths, args.concurrency, args.client_delay
+    ), baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Накладные расходы аутентификации на запрос.
+
+Сравнивает пропускную способность с кэшем JWT и без него, а также
+цепочку TokenAuthentication + JWTAuthentication с одним JWTAuthentication
+для анонимных запросов и запросов с токеном.
+
+    python benchmarks/bench_auth.py [--requests N] [--tokens K]
+"""
+import argparse
+
+from common import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--tokens', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client, RequestFactory
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.request import Request
+
+    from api.backends import JWTAuthentication, token_cache
+    from users.models import User
+
+    users = [
+        User.objects.create(username=f'bench{n}', email=f'bench{n}@ya.fake')
+        for n in range(args.tokens)
+    ]
+    client = Client()
+    headers = [f'Bearer {user.token}' for user in users]
+    counter = iter(range(10 ** 9))
+
+    def request():
+        response = client.get(
+            '/api/v1/users/me/',
+            HTTP_AUTHORIZATION=headers[next(counter) % len(headers)],
+        )
+        assert response.status_code == 200, response.status_code
+
+    factory = RequestFactory()
+    auth_requests = [
+        Request(factory.get('/', HTTP_AUTHORIZATION=header))
+        for header in headers
+    ]
+    backend = JWTAuthentication()
+
+    def authenticate():
+        backend.authenticate(auth_requests[next(counter) % len(headers)])
+
+    size = token_cache.max_size
+    for name, func, repeat in (
+        ('GET /api/v1/users/me/', request, args.requests),
+        ('JWTAuthentication.authenticate', authenticate, args.requests * 10),
+    ):
+        token_cache.max_size = 0
+        token_cache.clear()
+        baseline = measure(func, repeat)
+        report(f'{name}: без кэша', baseline)
+        token_cache.max_size = size
+        measure(func, len(headers))
+        report(f'{name}: с кэшем', measure(func, repeat), baseline)
+
+    chains = (
+        ('Token + JWT', (TokenAuthentication(), backend)),
+        ('JWT', (backend,)),
+    )
+    for name, header in (('аноним', None), ('Bearer', headers[0])):
+        meta = {'HTTP_AUTHORIZATION': header} if header else {}
+        django_request = factory.get('/', **meta)
+        baseline = None
+        for chain_name, authenticators in chains:
+            def authenticate_chain():
+                Request(django_request, authenticators=authenticators).user
+
+            rate = measure(authenticate_chain, args.requests * 10)
+            report(f'{chain_name}, {name}', rate, baseline)
+            baseline = baseline or rate
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Скорость импорта CSV командой importdb.
+
+Генерирует набор данных с заданным количеством отзывов и сравнивает
+построчный импорт через get_or_create (как в прежней версии команды)
+с потоковым импортом пачками bulk_create.
+
+С --jobs больше 1 дополнительно сравнивает параллельную загрузку
+с последовательной.
+
+    python benchmarks/bench_importdb.py [--reviews N] [--legacy-rows K]
+                                        [--jobs J]
+"""
+import argparse
+import csv
+import math
+import os
+import tempfile
+import time
+
+from common import report, setup_django
+
+PUB_DATE = '2020-01-13T23:20:02.422Z'
+
+
+def write_csv(directory, name, header, rows):
+    path = os.path.join(directory, f'{name}.csv')
+    with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate(directory, reviews):
+    side = math.isqrt(reviews - 1) + 1
+    write_csv(directory, 'users', (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ), (
+        (n, f'user{n}', f'user{n}@yamdb.fake', 'user', '', '', '')
+        for n in range(1, side + 1)
+    ))
+    write_csv(directory, 'category', ('id', 'name', 'slug'), (
+        (1, 'Фильм', 'movie'),
+    ))
+    write_csv(directory, 'genre', ('id', 'name', 'slug'), (
+        (1, 'Драма', 'drama'),
+    ))
+    write_csv(directory, 'titles', ('id', 'name', 'year', 'category'), (
+        (n, f'Произведение {n}', 2000, 1) for n in range(1, side + 1)
+    ))
+    write_csv(directory, 'genre_title', ('id', 'title_id', 'genre_id'), (
+        (n, n, 1) for n in range(1, side + 1)
+    ))
+    write_csv(directory, 'review', (
+        'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+    ), (
+        (n + 1, n // side + 1, f'Отзыв {n}', n % side + 1, n % 10 + 1,
+         PUB_DATE)
+        for n in range(reviews)
+    ))
+    write_csv(directory, 'comments', (
+        'id', 'review_id', 'text', 'author', 'pub_date'
+    ), (
+        (n, n * 10, f'Комментарий {n}', 1, PUB_DATE)
+        for n in range(1, reviews // 10 + 1)
+    ))
+
+
+def legacy_import_reviews(path, limit):
+    from django.shortcuts import get_object_or_404
+
+    from reviews.models import Review, Title, User
+
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        for number, row in enumerate(csv.DictReader(csv_file)):
+            if number == limit:
+                return
+            Review.objects.get_or_create(
+                id=row['id'],
+                title=get_object_or_404(Title, id=row['title_id']),
+                text=row['text'],
+                author=get_object_or_404(User, id=row['author']),
+                score=row['score'],
+                pub_date=row['pub_date'],
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reviews', type=int, default=1_000_000)
+    parser.add_argument('--legacy-rows', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    from reviews.management.commands.importdb import import_table
+    from reviews.models import Comment, Review
+    from reviews.tables import TABLES_BY_NAME
+
+    with tempfile.TemporaryDirectory() as directory:
+        generate(directory, args.reviews)
+        known_ids = {}
+        for name in ('users', 'category', 'titles'):
+            table = TABLES_BY_NAME[name]
+            import_table(
+                table,
+                os.path.join(directory, table.file),
+                known_ids,
+                args.batch_size,
+            )
+
+        start = time.perf_counter()
+        legacy_import_reviews(
+            os.path.join(directory, 'review.csv'), args.legacy_rows
+        )
+        legacy = args.legacy_rows / (time.perf_counter() - start)
+        report('review.csv, get_or_create, rows', legacy)
+        Review.objects.all().delete()
+
+        table = TABLES_BY_NAME['review']
+        start = time.perf_counter()
+        import_table(
+            table,
+            os.path.join(directory, table.file),
+            known_ids,
+            args.batch_size,
+        )
+        report(
+            'review.csv, bulk_create, rows',
+            args.reviews / (time.perf_counter() - start),
+            legacy,
+        )
+
+        sequential = None
+        for jobs in sorted({1, args.jobs}):
+            for model in (Comment, Review):
+                model.objects.all()._raw_delete(model.objects.db)
+            start = time.perf_counter()
+            call_command(
+                'importdb',
+                path=directory,
+                batch_size=args.batch_size,
+                jobs=jobs,
+                stdout=open(os.devnull, 'w'),
+            )
+            rate = args.reviews / (time.perf_counter() - start)
+            report(
+                f'importdb --jobs {jobs}, {args.reviews:,} reviews',
+                rate,
+                sequential or legacy,
+            )
+            sequential = sequential or rate
+
+
+if __name__ == '__main__':
+    main()
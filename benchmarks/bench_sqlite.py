@@ -0,0 +1,172 @@
+"""Параллельные чтения и записи в файловую базу SQLite по профилям PRAGMA.
+
+Читатели выбирают отзывы произведения, писатели в транзакции читают
+произведение и добавляют отзыв с пересчётом рейтинга, как POST к
+/api/v1/titles/{id}/reviews/. Профили добавляют PRAGMA из SQLITE_PRAGMAS
+по одной, начиная со стандартной конфигурации, последний включает
+SQLITE_TRANSACTION_MODE; для каждого профиля база копируется из шаблона.
+
+    python benchmarks/bench_sqlite.py [--seconds S] [--readers R]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from common import report, setup_django
+
+
+def prepare_template(path, titles):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    settings.SQLITE_PRAGMAS = {}
+    connection.settings_dict['NAME'] = path
+    call_command('migrate', verbosity=0)
+    from reviews.models import Category, Title
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {n}', year=2000, category=category)
+        for n in range(titles)
+    )
+    connection.close()
+
+
+class Workload:
+    def __init__(self, title_ids):
+        self.title_ids = title_ids
+        self.stop = threading.Event()
+        self.counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        self.lock = threading.Lock()
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def reader(self, number):
+        from django.db import OperationalError, connection
+
+        from reviews.models import Review, Title
+        try:
+            while not self.stop.is_set():
+                title_id = self.title_ids[
+                    self.counts['reads'] % len(self.title_ids)
+                ]
+                try:
+                    list(Review.objects.filter(
+                        title_id=title_id
+                    ).select_related('author').order_by('-pub_date')[:20])
+                    Title.objects.get(pk=title_id)
+                except OperationalError:
+                    self.count('errors')
+                else:
+                    self.count('reads')
+        finally:
+            connection.close()
+
+    def writer(self, number):
+        from django.db import OperationalError, connection, transaction
+
+        from reviews.models import Review, Title
+        from users.models import User
+        sequence = 0
+        try:
+            while not self.stop.is_set():
+                sequence += 1
+                try:
+                    with transaction.atomic():
+                        title = Title.objects.get(
+                            pk=self.title_ids[sequence % len(self.title_ids)]
+                        )
+                        author = User.objects.create(
+                            username=f'writer{number}-{sequence}',
+                            email=f'writer{number}-{sequence}@ya.fake',
+                        )
+                        Review.objects.create(
+                            title=title, author=author, text='Отзыв', score=5,
+                        )
+                except OperationalError:
+                    self.count('errors')
+                else:
+                    self.count('writes')
+        finally:
+            connection.close()
+
+
+def run_profile(path, pragmas, transaction_mode, args):
+    from django.conf import settings
+    from django.db import connection
+
+    from reviews.models import Title
+
+    settings.SQLITE_PRAGMAS = pragmas
+    settings.SQLITE_TRANSACTION_MODE = transaction_mode
+    connection.settings_dict['NAME'] = path
+    workload = Workload(list(Title.objects.values_list('pk', flat=True)))
+    connection.close()
+    threads = [
+        threading.Thread(target=workload.reader, args=(n,))
+        for n in range(args.readers)
+    ] + [
+        threading.Thread(target=workload.writer, args=(n,))
+        for n in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    workload.stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        key: value / args.seconds for key, value in workload.counts.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--titles', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django(test_db=False)
+    from django.conf import settings
+    tuned = dict(settings.SQLITE_PRAGMAS)
+    transaction_mode = settings.SQLITE_TRANSACTION_MODE
+
+    directory = tempfile.mkdtemp()
+    try:
+        template = os.path.join(directory, 'template.sqlite3')
+        prepare_template(template, args.titles)
+        profiles = [('стандартные настройки', {}, 'DEFERRED')]
+        for name, value in tuned.items():
+            profiles.append((
+                f'+ {name}={value}', {**profiles[-1][1], name: value},
+                'DEFERRED',
+            ))
+        profiles.append(
+            (f'+ BEGIN {transaction_mode}', tuned, transaction_mode)
+        )
+        print(
+            f'{args.readers} читателей, {args.writers} писателей, '
+            f'{args.seconds:g} с на профиль'
+        )
+        baseline = None
+        for number, (name, pragmas, mode) in enumerate(profiles):
+            path = os.path.join(directory, f'profile{number}.sqlite3')
+            shutil.copy(template, path)
+            rates = run_profile(path, pragmas, mode, args)
+            baseline = baseline or rates
+            report(f'{name}: чтения', rates['reads'], baseline['reads'])
+            report(f'{name}: записи', rates['writes'], baseline['writes'])
+            report(f'{name}: database is locked', rates['errors'])
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def setup_django(test_db=True):
+    import django
+    django.setup()
+    from django.conf import settings
+    settings.ALLOWED_HOSTS = ['*']
+    settings.DEBUG = False
+    if test_db:
+        from django.db import connection
+        connection.creation.create_test_db(verbosity=0)
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    return repeat / elapsed
+
+
+def report(name, rate, baseline=None):
+    line = f'{name:<45} {rate:>12,.0f} ops/s'
+    if baseline:
+        line += f'  x{rate / baseline:.2f}'
+    print(line)
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+from api.backends import token_versions, user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+    token_versions.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+    token_versions.clear()
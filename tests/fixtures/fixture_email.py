@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_outbox(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
@@ -0,0 +1,74 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_rating(client, title_id):
+    return client.get(f'/api/v1/titles/{title_id}/').json().get('rating')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Rating:
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 9)
+        review = create_single_review(
+            user_client, title_id, 'Неплохо', 6
+        ).json()
+        create_single_review(moderator_client, title_id, 'Так себе', 4)
+        assert get_rating(admin_client, title_id) == 6, (
+            'Рейтинг произведения должен быть равен средней оценке отзывов.'
+        )
+
+        user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/',
+            data={'score': 3}
+        )
+        assert get_rating(admin_client, title_id) == 5, (
+            'После изменения оценки в отзыве рейтинг произведения должен '
+            'быть пересчитан.'
+        )
+
+        user.delete()
+        assert get_rating(admin_client, title_id) == 6, (
+            'После удаления автора отзыва рейтинг произведения должен быть '
+            'пересчитан.'
+        )
+
+        for review in admin_client.get(
+            f'/api/v1/titles/{title_id}/reviews/'
+        ).json()['results']:
+            admin_client.delete(
+                f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+            )
+        assert get_rating(admin_client, title_id) is None, (
+            'Если отзывов о произведении нет - значением поля `rating` '
+            'должно быть `None`.'
+        )
+
+    def test_02_checkratings_reports_drift(self, admin_client, user_client):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 6)
+        Review.objects.update(score=10)
+
+        out = StringIO()
+        call_command('checkratings', stdout=out)
+        assert f'{title_id} ' in out.getvalue(), (
+            'Команда `checkratings` должна сообщать о произведениях, '
+            'у которых сохранённый рейтинг расходится с отзывами.'
+        )
+
+        call_command('checkratings', '--fix', stdout=StringIO())
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (10, 1), (
+            'Команда `checkratings --fix` должна пересчитать рейтинг.'
+        )
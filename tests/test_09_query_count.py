@@ -0,0 +1,93 @@
+import pytest
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre)
+
+
+def create_titles_in_bulk(count):
+    Category.objects.bulk_create([
+        Category(name='Фильм', slug='movie'),
+        Category(name='Книга', slug='book'),
+    ])
+    categories = list(Category.objects.order_by('pk'))
+    Genre.objects.bulk_create([
+        Genre(name='Драма', slug='drama'),
+        Genre(name='Комедия', slug='comedy'),
+    ])
+    genres = list(Genre.objects.order_by('pk'))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {number}',
+            year=2000,
+            category=categories[number % len(categories)],
+        )
+        for number in range(count)
+    )
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title_id=title_id, genre=genre)
+        for title_id in Title.objects.values_list('pk', flat=True)
+        for genre in genres
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_01_titles_list(self, client, django_assert_num_queries,
+                            page_size):
+        create_titles_in_bulk(page_size)
+        url = f'/api/v1/titles/?limit={page_size}'
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        results = response.json()['results']
+        assert len(results) == page_size, (
+            f'Проверьте, что `{url}` возвращает запрошенное число записей.'
+        )
+        assert all(
+            title['category'] and len(title['genre']) == 2
+            for title in results
+        ), (
+            f'Проверьте, что `{url}` возвращает категорию и жанры '
+            'каждого произведения.'
+        )
+
+    def test_02_reviews_and_comments_list(self, client,
+                                          django_assert_max_num_queries,
+                                          django_user_model):
+        create_titles_in_bulk(1)
+        title = Title.objects.get()
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'author{number}',
+                email=f'author{number}@yamdb.fake',
+            )
+            for number in range(100)
+        )
+        authors = list(django_user_model.objects.all())
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        review = Review.objects.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for author in authors
+        )
+
+        url = f'/api/v1/titles/{title.pk}/reviews/?limit=100'
+        with django_assert_max_num_queries(3):
+            response = client.get(url)
+        assert len(response.json()['results']) == 100, (
+            f'Проверьте, что `{url}` возвращает запрошенное число записей.'
+        )
+
+        url = (
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+            '?limit=100'
+        )
+        with django_assert_max_num_queries(3):
+            response = client.get(url)
+        assert len(response.json()['results']) == 100, (
+            f'Проверьте, что `{url}` возвращает запрошенное число записей.'
+        )
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_reviews
+
+
+def collect_pages(client, url):
+    results = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data and 'next' in data, (
+            f'Проверьте, что при курсорной пагинации `{url}` возвращает '
+            'ключи `next` и `previous` и не возвращает `count`.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+        pages += 1
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_reviews_cursor(self, admin_client, admin, user, moderator,
+                               user_client, moderator_client):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        reviews, titles = create_reviews(admin_client, authors_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            '?pagination=cursor&limit=2'
+        )
+        results, pages = collect_pages(admin_client, url)
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reviews
+        ], (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы по порядку даты публикации.'
+        )
+        assert pages == 2
+
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?limit=2'
+        )
+        assert response.json()['count'] == len(reviews), (
+            'Пагинация limit/offset должна работать как прежде, если '
+            'курсорная пагинация не запрошена.'
+        )
+
+    def test_02_comments_cursor(self, admin_client, admin, user, moderator,
+                                user_client, moderator_client):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/?pagination=cursor&limit=1'
+        )
+        results, pages = collect_pages(admin_client, url)
+        assert [comment['id'] for comment in results] == [
+            comment['id'] for comment in comments
+        ], (
+            'Проверьте, что курсорная пагинация комментариев возвращает все '
+            'комментарии по порядку даты публикации.'
+        )
+        assert pages == len(comments)
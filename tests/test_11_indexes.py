@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Review, TitleGenre
+
+
+def check_plan(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, (
+        f'Запрос `{queryset.query}` должен использовать индекс '
+        f'`{index_name}`. План запроса: {plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Запрос `{queryset.query}` не должен сортировать записи во '
+        f'временном B-дереве. План запроса: {plan}'
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса SQLite'
+)
+@pytest.mark.django_db
+class Test11Indexes:
+
+    def test_01_reviews_by_title(self):
+        check_plan(
+            Review.objects.filter(title_id=1).order_by('pub_date', 'id'),
+            'review_title_pub_date_idx',
+        )
+
+    def test_02_comments_by_review(self):
+        check_plan(
+            Comment.objects.filter(review_id=1).order_by('pub_date', 'id'),
+            'comment_review_pub_date_idx',
+        )
+
+    def test_03_titles_by_genre(self):
+        check_plan(
+            TitleGenre.objects.filter(genre_id=1).values('title_id'),
+            'titlegenre_genre_title_idx',
+        )
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+
+from tests.utils import create_categories, create_genre
+
+
+def create_title(admin_client, name, description, genres, categories):
+    response = admin_client.post('/api/v1/titles/', data={
+        'name': name,
+        'year': 2000,
+        'genre': [genres[0]['slug']],
+        'category': categories[0]['slug'],
+        'description': description,
+    })
+    return response.json()['id']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    def test_01_search(self, admin_client, client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        args = (genres, categories)
+        terminator = create_title(
+            admin_client, 'Терминатор', 'Киборг из будущего', *args
+        )
+        sequel = create_title(
+            admin_client, 'Терминатор 2', 'Киборг возвращается', *args
+        )
+        other = create_title(
+            admin_client, 'Крепкий орешек', 'Полицейский и небоскрёб', *args
+        )
+
+        url = '/api/v1/titles/?search=терминат'
+        results = client.get(url).json()['results']
+        assert {title['id'] for title in results} == {terminator, sequel}, (
+            f'Проверьте, что `{url}` находит произведения по началу слова '
+            'в названии без учёта регистра.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{other}/',
+            data={'description': 'Киборга здесь нет, только полицейский'},
+        )
+        admin_client.delete(f'/api/v1/titles/{sequel}/')
+        url = '/api/v1/titles/?search=киборг'
+        results = client.get(url).json()['results']
+        assert {title['id'] for title in results} == {terminator, other}, (
+            f'Проверьте, что `{url}` учитывает изменения и удаления '
+            'произведений.'
+        )
+
+        url = '/api/v1/titles/?search=терминатор будущ'
+        results = client.get(url).json()['results']
+        assert [title['id'] for title in results] == [terminator], (
+            f'Проверьте, что `{url}` ищет по всем словам запроса.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Полнотекстовый индекс SQLite'
+    )
+    def test_02_search_uses_fts(self):
+        from reviews.models import Title
+        from reviews.search import FTS_TABLE, search_titles
+
+        queryset = search_titles(Title.objects.all(), 'терминатор')
+        assert f'{FTS_TABLE} MATCH' in str(queryset.query), (
+            'Поиск произведений в SQLite должен использовать FTS5.'
+        )
@@ -0,0 +1,68 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+def get_ids(client, url):
+    return sorted(title['id'] for title in client.get(url).json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleFilters:
+
+    def test_01_genre_filters(self, admin_client, client):
+        titles, _, genres = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        horror, comedy, drama = (genre['slug'] for genre in genres)
+
+        url = '/api/v1/titles/?genre=dram'
+        assert get_ids(client, url) == [], (
+            f'Проверьте, что `{url}` ищет жанр по точному совпадению `slug`.'
+        )
+        url = f'/api/v1/titles/?genre={comedy},{drama}'
+        assert get_ids(client, url) == [terminator, die_hard], (
+            f'Проверьте, что `{url}` возвращает произведения, относящиеся '
+            'хотя бы к одному из перечисленных жанров.'
+        )
+        url = f'/api/v1/titles/?genre__all={horror},{comedy}'
+        assert get_ids(client, url) == [terminator], (
+            f'Проверьте, что `{url}` возвращает произведения, относящиеся '
+            'ко всем перечисленным жанрам.'
+        )
+        url = f'/api/v1/titles/?genre__all={horror},{drama}'
+        assert get_ids(client, url) == [], (
+            f'Проверьте, что `{url}` возвращает произведения, относящиеся '
+            'ко всем перечисленным жанрам.'
+        )
+        url = '/api/v1/titles/?genre__contains=o'
+        assert get_ids(client, url) == [terminator], (
+            f'Проверьте, что `{url}` ищет жанр по вхождению подстроки и не '
+            'дублирует произведения.'
+        )
+
+    def test_02_category_filters(self, admin_client, client):
+        titles, categories, _ = create_titles(admin_client)
+        films, books = (category['slug'] for category in categories)
+
+        url = f'/api/v1/titles/?category={films[:-1]}'
+        assert get_ids(client, url) == [], (
+            f'Проверьте, что `{url}` ищет категорию по точному совпадению '
+            '`slug`.'
+        )
+        url = f'/api/v1/titles/?category={films},{books}'
+        assert get_ids(client, url) == sorted(
+            title['id'] for title in titles
+        ), (
+            f'Проверьте, что `{url}` возвращает произведения из всех '
+            'перечисленных категорий.'
+        )
+        url = f'/api/v1/titles/?category__contains={books[:-1]}'
+        assert get_ids(client, url) == [titles[1]['id']], (
+            f'Проверьте, что `{url}` ищет категорию по вхождению подстроки.'
+        )
+
+    def test_03_genre_filter_is_one_query(self, client, admin_client,
+                                          django_assert_num_queries):
+        create_titles(admin_client)
+        with django_assert_num_queries(4):
+            client.get('/api/v1/titles/?genre=horror,comedy')
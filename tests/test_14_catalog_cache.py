@@ -0,0 +1,52 @@
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def cache_backend(request, settings, tmp_path):
+    if request.param == 'filebased':
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CatalogCache:
+
+    @pytest.mark.parametrize('url,create', (
+        ('/api/v1/categories/', create_categories),
+        ('/api/v1/genres/', create_genre),
+    ))
+    def test_01_list_cached_and_invalidated(self, admin_client, client,
+                                            django_assert_num_queries,
+                                            cache_backend, url, create):
+        objects = create(admin_client)
+        response = client.get(url)
+        assert response.json()['count'] == len(objects)
+
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+        assert cached.json() == response.json(), (
+            f'Повторный GET-запрос к `{url}` должен вернуть ответ из кэша.'
+        )
+        assert client.get(f'{url}?limit=1').json()['results'] == (
+            response.json()['results'][:1]
+        ), 'Ключ кэша должен учитывать параметры запроса.'
+
+        admin_client.delete(f'{url}{objects[0]["slug"]}/')
+        response = client.get(url)
+        assert response.json()['count'] == len(objects) - 1, (
+            f'После удаления объекта кэш `{url}` должен быть сброшен.'
+        )
+
+        admin_client.post(url, data={'name': 'Новый', 'slug': 'new'})
+        response = client.get(f'{url}?search=Новый')
+        assert response.json()['count'] == 1, (
+            f'После создания объекта кэш `{url}` должен быть сброшен.'
+        )
@@ -0,0 +1,121 @@
+import time
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review
+
+
+def check_revalidation(client, url, django_assert_max_num_queries):
+    response = client.get(url)
+    etag = response.get('ETag')
+    assert response.status_code == HTTPStatus.OK and etag, (
+        f'Проверьте, что ответ на GET-запрос к `{url}` содержит заголовок '
+        '`ETag`.'
+    )
+    assert response.get('Last-Modified'), (
+        f'Проверьте, что ответ на GET-запрос к `{url}` содержит заголовок '
+        '`Last-Modified`.'
+    )
+    with django_assert_max_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f'Если `If-None-Match` GET-запроса к `{url}` совпадает с `ETag` - '
+        'должен вернуться ответ со статусом 304.'
+    )
+    return etag
+
+
+def check_changed(client, url, etag):
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        f'После изменения данных GET-запрос к `{url}` с прежним '
+        '`If-None-Match` должен вернуть ответ со статусом 200.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def test_01_titles_reviews_comments(self, client, admin_client, admin,
+                                        user, user_client, moderator_client,
+                                        django_assert_max_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            f'{comments[0]["id"]}/',
+        )
+        etags = {
+            url: check_revalidation(
+                client, url, django_assert_max_num_queries
+            )
+            for url in urls
+        }
+
+        time.sleep(0.01)
+        create_single_review(moderator_client, title_id, 'Новый отзыв', 1)
+        for url in urls:
+            check_changed(client, url, etags[url])
+
+    def test_02_comment_and_category_changes(self, client, admin_client,
+                                             admin, user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        etag = client.get(url)['ETag']
+        time.sleep(0.01)
+        user_client.delete(f'{url}{comments[1]["id"]}/')
+        check_changed(client, url, etag)
+
+        url = f'/api/v1/titles/{title_id}/'
+        etag = client.get(url)['ETag']
+        time.sleep(0.01)
+        admin_client.delete('/api/v1/genres/horror/')
+        check_changed(client, url, etag)
+
+    def test_03_author_rename(self, client, admin_client, admin, user,
+                              user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = (
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        time.sleep(0.01)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url in urls:
+            check_changed(client, url, etags[url])
+
+    def test_04_no_validators_by_default(self):
+        from rest_framework.response import Response
+        from rest_framework.test import APIRequestFactory
+
+        from api.conditional import ConditionalGetMixin
+
+        class View(ConditionalGetMixin):
+            pass
+
+        request = APIRequestFactory().get('/', HTTP_IF_NONE_MATCH='*')
+        response = View().conditional_response(
+            lambda request: Response(status=HTTPStatus.OK), request
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('ETag'), (
+            'Без get_validators() ответ должен формироваться как обычно.'
+        )
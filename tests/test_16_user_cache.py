@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.backends import user_cache, user_version_prefix
+from api.cache import bump_version
+from reviews.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16UserCache:
+
+    def test_01_user_loaded_once(self, user_client, user,
+                                 django_assert_num_queries):
+        url = '/api/v1/users/me/'
+        user_client.get(url)
+        misses = user_cache.misses
+        with django_assert_num_queries(0):
+            response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['username'] == user.username
+        assert user_cache.misses == misses and user_cache.hits >= 1, (
+            'Повторный запрос с тем же токеном должен брать пользователя '
+            'из кэша.'
+        )
+
+    def test_02_role_change_invalidates(self, admin_client, user_client,
+                                        user):
+        url = '/api/v1/users/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        admin_client.patch(f'{url}{user.username}/', data={'role': 'admin'})
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Изменение роли пользователя должно применяться сразу, '
+            'без ожидания истечения кэша.'
+        )
+
+    def test_03_deactivation_and_deletion(self, user_client, user):
+        url = '/api/v1/users/me/'
+        assert user_client.get(url).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert user_client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Деактивированный пользователь не должен проходить '
+            'аутентификацию.'
+        )
+        user.delete()
+        assert user_client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_04_change_from_another_worker(self, user_client, user):
+        url = '/api/v1/users/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        User.objects.filter(pk=user.pk).update(role='admin')
+        bump_version(user_version_prefix(user.pk))
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Изменение пользователя в другом процессе должно сбрасывать '
+            'его копию в локальном кэше через общий кэш.'
+        )
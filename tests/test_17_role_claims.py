@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def role_claims(settings):
+    settings.JWT_AUTH = {**settings.JWT_AUTH, 'ROLE_CLAIMS': True}
+
+
+def claims_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {user.token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17RoleClaims:
+
+    def test_01_no_user_queries(self, role_claims, admin,
+                                django_assert_num_queries):
+        client = claims_client(admin)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.OK
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Токен с ролью должен позволять проверять права без загрузки '
+            'пользователя из базы.'
+        )
+
+        response = client.get(f'{url}me/')
+        assert response.json()['email'] == admin.email, (
+            f'`{url}me/` должен возвращать полные данные пользователя.'
+        )
+
+    def test_02_write_with_claims(self, role_claims, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client = claims_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, data={'text': 'Хорошо', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        response = client.patch(review_url, data={'score': 8})
+        assert response.status_code == HTTPStatus.OK, (
+            'Автор должен иметь возможность изменить свой отзыв по токену '
+            'с ролью.'
+        )
+
+    @pytest.mark.parametrize('change', ('role', 'is_active', 'delete'))
+    def test_03_revocation(self, role_claims, admin, change):
+        client = claims_client(admin)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.OK
+        if change == 'role':
+            admin.role = 'user'
+            admin.save()
+        elif change == 'is_active':
+            admin.is_active = False
+            admin.save()
+        else:
+            admin.delete()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'После смены роли, деактивации или удаления пользователя '
+            'ранее выданный токен должен быть отозван.'
+        )
+
+    def test_04_refresh_from_database(self, role_claims, admin,
+                                      django_user_model):
+        from api.backends import token_versions
+
+        client = claims_client(admin)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.OK
+        django_user_model.objects.filter(pk=admin.pk).update(
+            token_version=admin.token_version + 1
+        )
+        token_versions.clear()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Таблица версий токенов должна обновляться из базы.'
+        )
+
+    def test_05_deletion_seen_by_other_workers(self, role_claims, admin):
+        from django.core.cache import cache
+
+        from api.backends import token_versions
+
+        client = claims_client(admin)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.OK
+        admin.delete()
+        cache.clear()
+        token_versions.clear()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Удаление пользователя должно отзывать его токены во всех '
+            'процессах, а не только через локальный кэш.'
+        )
+
+    def test_06_incremental_import_revokes_roles(self, role_claims, admin,
+                                                 user, tmp_path):
+        import csv
+
+        from django.core.management import call_command
+
+        from api.backends import token_versions
+
+        client = claims_client(admin)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.OK
+
+        def write_users(role):
+            with open(tmp_path / 'users.csv', 'w', encoding='utf-8',
+                      newline='') as users_file:
+                writer = csv.writer(users_file)
+                writer.writerow((
+                    'id', 'username', 'email', 'role', 'bio', 'first_name',
+                    'last_name',
+                ))
+                writer.writerow((
+                    admin.pk, admin.username, admin.email, role, 'Админ',
+                    '', '',
+                ))
+                writer.writerow((
+                    user.pk, user.username, user.email, user.role,
+                    'Пользователь', '', '',
+                ))
+
+        write_users(admin.role)
+        call_command('importdb', path=str(tmp_path), incremental=True)
+        write_users('user')
+        call_command('importdb', path=str(tmp_path), incremental=True)
+        admin.refresh_from_db()
+        user.refresh_from_db()
+        assert admin.role == 'user' and admin.token_version == 1, (
+            'Смена роли при инкрементальном импорте должна увеличивать '
+            '`token_version`.'
+        )
+        assert user.token_version == 0
+        token_versions.clear()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Токен пользователя, роль которого изменил импорт, должен '
+            'отзываться.'
+        )
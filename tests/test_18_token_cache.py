@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.backends import token_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TokenCache:
+
+    def test_01_valid_token_decoded_once(self, user_client):
+        token_cache.clear()
+        url = '/api/v1/users/me/'
+        user_client.get(url)
+        hits, misses = token_cache.hits, token_cache.misses
+        assert user_client.get(url).status_code == HTTPStatus.OK
+        assert (token_cache.hits, token_cache.misses) == (hits + 1, misses), (
+            'Повторный запрос с тем же токеном должен брать расшифрованный '
+            'токен из кэша.'
+        )
+
+    def test_02_invalid_token_cached(self, client):
+        token_cache.clear()
+        hits = token_cache.hits
+        url = '/api/v1/users/me/'
+        for _ in range(2):
+            response = client.get(
+                url, HTTP_AUTHORIZATION='Bearer not.a.token'
+            )
+            assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+                'Запрос с некорректным токеном должен возвращать ответ со '
+                'статусом 401.'
+            )
+        assert token_cache.hits == hits + 1, (
+            'Некорректный токен должен кэшироваться как недействительный.'
+        )
+
+    @pytest.mark.parametrize('header', (
+        'Token 0123456789abcdef', 'Bearer', 'Bearer a b', 'Basic dXNlcg=='
+    ))
+    def test_03_foreign_headers_are_anonymous(self, client, header):
+        url = '/api/v1/titles/'
+        response = client.get(url, HTTP_AUTHORIZATION=header)
+        assert response.status_code == HTTPStatus.OK, (
+            f'GET-запрос к `{url}` с заголовком `Authorization: {header}` '
+            'должен обрабатываться как анонимный.'
+        )
@@ -0,0 +1,218 @@
+import smtplib
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def lazy_outbox(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': False}
+    return settings.EMAIL_OUTBOX
+
+
+def enqueue(count):
+    from users.outbox import enqueue_email
+
+    return [
+        enqueue_email('Тема', f'Письмо {number}', f'user{number}@yamdb.fake')
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19EmailOutbox:
+
+    def test_01_signup_uses_outbox(self, client, lazy_outbox):
+        from users.models import OutgoingEmail
+
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.json() == data
+        assert mail.outbox == [], (
+            'Письмо с кодом подтверждения должно ставиться в очередь, '
+            'а не отправляться во время запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to_email == data['email']
+
+        call_command('sendoutbox', workers=2)
+        assert [message.to for message in mail.outbox] == [[data['email']]], (
+            'Команда `sendoutbox` должна отправить письма из очереди.'
+        )
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT and email.sent_at
+        call_command('sendoutbox')
+        assert len(mail.outbox) == 1, 'Письмо не должно отправляться дважды.'
+
+    def test_02_batches_share_connection(self, lazy_outbox, monkeypatch):
+        from users import outbox
+
+        opened = []
+        get_connection = outbox.get_connection
+
+        def counting_get_connection(*args, **kwargs):
+            connection = get_connection(*args, **kwargs)
+            opened.append(connection)
+            return connection
+
+        monkeypatch.setattr(outbox, 'get_connection', counting_get_connection)
+        enqueue(5)
+        assert outbox.drain(batch_size=2, workers=1) == 5
+        assert len(mail.outbox) == 5
+        assert len(opened) == 1, (
+            'Поток отправки должен использовать одно соединение для всех '
+            'пачек писем.'
+        )
+
+    def test_03_retry_with_backoff(self, lazy_outbox, monkeypatch):
+        from users.models import OutgoingEmail
+        from users.outbox import drain
+
+        def fail(self, messages):
+            raise smtplib.SMTPServerDisconnected('Нет соединения')
+
+        send_messages = EmailBackend.send_messages
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        email, = enqueue(1)
+        assert drain() == 0
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1 and email.last_error
+        assert email.next_attempt_at > timezone.now(), (
+            'Неудачная отправка должна откладываться на время ожидания.'
+        )
+        assert drain() == 0 and email.attempts == 1, (
+            'Письмо не должно отправляться повторно до наступления времени '
+            'следующей попытки.'
+        )
+
+        delays = [email.next_attempt_at - timezone.now()]
+        for attempt in range(2, lazy_outbox['MAX_ATTEMPTS'] + 1):
+            OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+            drain()
+            email.refresh_from_db()
+            assert email.attempts == attempt
+            if email.status == OutgoingEmail.PENDING:
+                delays.append(email.next_attempt_at - timezone.now())
+        assert delays == sorted(delays) and len(set(delays)) == len(delays), (
+            'Время ожидания между попытками должно расти.'
+        )
+        assert email.status == OutgoingEmail.FAILED, (
+            'После исчерпания попыток письмо должно помечаться неотправленным.'
+        )
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', send_messages)
+        enqueue(1)
+        assert drain() == 1 and len(mail.outbox) == 1
+
+    def test_04_eager_delivery_after_commit(self, settings):
+        from django.db import transaction
+
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue(1)
+                raise RuntimeError
+        assert mail.outbox == [] and not OutgoingEmail.objects.exists(), (
+            'Письмо не должно отправляться, если транзакция отменена.'
+        )
+        with transaction.atomic():
+            enqueue(1)
+            assert mail.outbox == []
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().status == OutgoingEmail.SENT
+
+    def test_05_unreachable_smtp(self, client, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST, settings.EMAIL_PORT = '127.0.0.1', 1
+        settings.EMAIL_TIMEOUT = 1
+        settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': True}
+        data = {'email': 'smtp@yamdb.fake', 'username': 'smtp'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.json() == data, (
+            'Недоступный почтовый сервер не должен ломать регистрацию.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1 and email.last_error
+
+        settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': False}
+        enqueue(2)
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('sendoutbox')
+        assert list(
+            OutgoingEmail.objects.order_by('pk').values_list(
+                'attempts', flat=True
+            )
+        ) == [2, 1, 1], (
+            'Ошибка соединения должна засчитываться как неудачная попытка '
+            'для всех забранных писем.'
+        )
+        assert not OutgoingEmail.objects.exclude(claim=None).exists()
+
+    def test_06_partial_batch_is_recorded(self, lazy_outbox, monkeypatch):
+        from users.models import OutgoingEmail
+        from users.outbox import drain
+
+        send_messages = EmailBackend.send_messages
+
+        def fail_second(self, messages):
+            if messages[0].body == 'Письмо 1':
+                raise ValueError('Неожиданная ошибка')
+            return send_messages(self, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail_second)
+        enqueue(3)
+        assert drain(workers=1) == 2
+        statuses = dict(
+            OutgoingEmail.objects.values_list('body', 'status')
+        )
+        assert statuses == {
+            'Письмо 0': OutgoingEmail.SENT,
+            'Письмо 1': OutgoingEmail.PENDING,
+            'Письмо 2': OutgoingEmail.SENT,
+        }, 'Результат отправки должен сохраняться для каждого письма.'
+        assert OutgoingEmail.objects.get(body='Письмо 1').attempts == 1
+
+    def test_07_interval_survives_errors(self, lazy_outbox, monkeypatch):
+        from users.management.commands import sendoutbox
+
+        class Stop(Exception):
+            pass
+
+        calls = []
+
+        def failing_drain(*args):
+            calls.append(args)
+            raise OSError('Нет соединения')
+
+        def sleep(seconds):
+            if len(calls) == 2:
+                raise Stop
+
+        monkeypatch.setattr(sendoutbox, 'drain', failing_drain)
+        monkeypatch.setattr(sendoutbox.time, 'sleep', sleep)
+        with pytest.raises(OSError):
+            call_command('sendoutbox')
+        calls.clear()
+        with pytest.raises(Stop):
+            call_command('sendoutbox', interval=1)
+        assert len(calls) == 2, (
+            'Команда с `--interval` должна продолжать работу после ошибки.'
+        )
+
+    def test_08_lazy_by_default(self):
+        from api_yamdb import settings as project_settings
+
+        assert project_settings.EMAIL_OUTBOX['EAGER'] is False, (
+            'По умолчанию письма должны отправляться только командой '
+            '`sendoutbox`, а не во время запроса.'
+        )
+        assert project_settings.EMAIL_TIMEOUT
@@ -0,0 +1,120 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK')
+
+
+def count_queries(func, *args, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = func(*args, **kwargs)
+    statements = [
+        query['sql'].lstrip().split(' ', 1)[0].upper()
+        for query in context.captured_queries
+    ]
+    reads = sum(statement == 'SELECT' for statement in statements)
+    writes = sum(
+        statement not in ('SELECT', *TRANSACTION_STATEMENTS)
+        for statement in statements
+    )
+    return response, reads, writes
+
+
+@pytest.fixture
+def lazy_outbox(settings):
+    settings.EMAIL_OUTBOX = {**settings.EMAIL_OUTBOX, 'EAGER': False}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20AuthQueries:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    def test_01_signup_queries(self, client, lazy_outbox):
+        data = {'email': 'new@yamdb.fake', 'username': 'new_user'}
+        response, reads, writes = count_queries(
+            client.post, self.url_signup, data=data
+        )
+        assert response.status_code == 200
+        assert reads == 1, (
+            f'Регистрация через `{self.url_signup}` должна проверять '
+            'занятость `username` и `email` одним запросом.'
+        )
+        assert writes == 2, (
+            f'Регистрация через `{self.url_signup}` должна создавать '
+            'пользователя и письмо с кодом без лишних записей.'
+        )
+
+        response, reads, writes = count_queries(
+            client.post, self.url_signup, data=data
+        )
+        assert response.status_code == 200
+        assert (reads, writes) == (1, 1), (
+            f'Повторный запрос к `{self.url_signup}` не должен перезаписывать '
+            'пользователя.'
+        )
+
+        for conflict in (
+            {'email': data['email'], 'username': 'other_user'},
+            {'email': 'other@yamdb.fake', 'username': data['username']},
+        ):
+            response, reads, writes = count_queries(
+                client.post, self.url_signup, data=conflict
+            )
+            assert response.status_code == 400
+            assert (reads, writes) == (1, 0), (
+                f'Конфликт `username` или `email` в `{self.url_signup}` '
+                'должен определяться одним запросом.'
+            )
+
+    def test_02_signup_integrity_error(self, client, lazy_outbox,
+                                       monkeypatch):
+        from api.serializers import SignUpSerializer
+        from users.models import OutgoingEmail, User
+
+        User.objects.create(username='taken', email='taken@yamdb.fake')
+        validate = SignUpSerializer.validate
+
+        def validate_before_commit(self, data):
+            data = validate(self, data)
+            data['user'] = None
+            return data
+
+        monkeypatch.setattr(
+            SignUpSerializer, 'validate', validate_before_commit
+        )
+        response = client.post(
+            self.url_signup,
+            data={'email': 'other@yamdb.fake', 'username': 'taken'},
+        )
+        assert response.status_code == 400, (
+            'Если пользователь с таким `username` появился после проверки - '
+            f'`{self.url_signup}` должен вернуть ответ со статусом 400.'
+        )
+        assert not OutgoingEmail.objects.exists()
+
+    def test_03_token_queries(self, client, user):
+        from django.contrib.auth.tokens import default_token_generator
+
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        response, reads, writes = count_queries(
+            client.post, self.url_token, data=data
+        )
+        assert response.status_code == 201
+        assert (reads, writes) == (1, 0), (
+            f'Выдача токена через `{self.url_token}` должна выполнять один '
+            'запрос к базе.'
+        )
+
+        for data, status in (
+            ({**data, 'confirmation_code': '12345'}, 400),
+            ({**data, 'username': 'unexisting_user'}, 404),
+        ):
+            response, reads, writes = count_queries(
+                client.post, self.url_token, data=data
+            )
+            assert response.status_code == status
+            assert (reads, writes) == (1, 0)
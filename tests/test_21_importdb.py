@@ -0,0 +1,267 @@
+import csv
+import os
+from datetime import datetime, timezone
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static/data/')
+
+
+def write_csv(path, name, rows):
+    with open(path / f'{name}.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    write_csv(tmp_path, 'users', (
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+        *((100 + i, f'user{i}', f'user{i}@yamdb.fake', 'user', '', '', '')
+          for i in range(5)),
+    ))
+    write_csv(tmp_path, 'category', (
+        ('id', 'name', 'slug'),
+        (1, 'Фильм', 'movie'),
+    ))
+    write_csv(tmp_path, 'titles', (
+        ('id', 'name', 'year', 'category'),
+        (1, 'Фильм 1', 2000, 1),
+        (2, 'Фильм 2', 2001, ''),
+        (3, 'Фильм 3', 2002, 42),
+    ))
+    write_csv(tmp_path, 'review', (
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        *((i + 1, 1 + i % 2, f'Отзыв\n{i}', 100 + i, 2 + i,
+           '2020-01-13T23:20:02.422Z') for i in range(5)),
+        (6, 3, 'Нет произведения', 100, 5, '2020-01-13T23:20:02.422Z'),
+    ))
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ImportDB:
+
+    def test_01_import_repository_data(self):
+        from reviews.models import Comment, Review, Title, TitleGenre, User
+
+        call_command('importdb', path=DATA_DIR)
+        with open(os.path.join(DATA_DIR, 'review.csv'), encoding='utf-8') as f:
+            reviews = sum(1 for _ in csv.DictReader(f))
+        assert User.objects.count() == 5
+        assert Title.objects.count() == 32
+        assert TitleGenre.objects.count() == 42
+        assert Review.objects.count() == reviews
+        assert Comment.objects.exists()
+        assert all(
+            title.rating_count == title.reviews.count()
+            for title in Title.objects.all()
+        ), 'После импорта отзывов рейтинг произведений должен быть пересчитан.'
+
+    def test_02_batches_and_missing_relations(self, dataset, capsys):
+        from reviews.models import Review, Title
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('importdb', path=str(dataset), batch_size=2)
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT')
+            and '"reviews_review"' in query['sql']
+        ]
+        assert len(inserts) == 3, (
+            'Отзывы должны сохраняться пачками размера `--batch-size`.'
+        )
+        assert set(Title.objects.values_list('pk', flat=True)) == {1, 2}, (
+            'Строки со ссылками на несуществующие объекты должны '
+            'пропускаться.'
+        )
+        assert Review.objects.count() == 5
+        assert Title.objects.get(pk=1).rating == (2 + 4 + 6) // 3
+        output = capsys.readouterr().out
+        assert 'строк/с' in output and 'пропущено' in output
+
+        call_command('importdb', path=str(dataset))
+        assert Review.objects.count() == 5, (
+            'Повторный импорт не должен дублировать данные.'
+        )
+
+    def test_03_dependency_levels(self):
+        from reviews.management.commands.importdb import dependency_levels
+        from reviews.tables import TABLES
+
+        levels = [
+            {table.name for table in level}
+            for level in dependency_levels(TABLES)
+        ]
+        assert levels == [
+            {'users', 'category', 'genre'},
+            {'titles'},
+            {'genre_title', 'review'},
+            {'comments'},
+        ], 'Таблицы должны загружаться уровнями графа зависимостей.'
+
+    def test_04_chunks_keep_multiline_records(self):
+        from reviews.csvio import parse_chunk, read_chunks
+
+        path = os.path.join(DATA_DIR, 'review.csv')
+        with open(path, encoding='utf-8', newline='') as f:
+            expected = list(csv.DictReader(f))
+        chunks = list(read_chunks(path, chunk_size=512))
+        assert len(chunks) > 1
+        assert [
+            row for chunk in chunks for row in parse_chunk(chunk)
+        ] == expected, (
+            'Разбиение CSV на части не должно разрывать записи с '
+            'переводами строк внутри кавычек.'
+        )
+
+    def test_05_parallel_import(self):
+        from reviews.models import Comment, Review, Title, TitleGenre
+
+        call_command('importdb', path=DATA_DIR, jobs=3)
+        assert Title.objects.count() == 32
+        assert TitleGenre.objects.count() == 42
+        assert Review.objects.exists() and Comment.objects.exists()
+        assert not any(
+            title.rating_count != title.reviews.count()
+            for title in Title.objects.all()
+        )
+
+    def test_06_incremental(self, dataset, capsys):
+        from reviews.models import Review, Title
+
+        call_command('importdb', path=str(dataset), incremental=True)
+        assert (dataset / '.importdb-manifest.json').exists(), (
+            'Режим `--incremental` должен сохранять манифест с '
+            'контрольными суммами файлов.'
+        )
+        capsys.readouterr()
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('importdb', path=str(dataset), incremental=True)
+        output = capsys.readouterr().out
+        assert output.count('не изменился') == 4, (
+            'Неизменённые файлы должны пропускаться в режиме `--incremental`.'
+        )
+        assert not any(
+            query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+            for query in context.captured_queries
+        )
+
+        write_csv(dataset, 'review', (
+            ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+            (1, 1, 'Отзыв\n0', 100, 10, '2020-01-13T23:20:02.422Z'),
+            *((i + 1, 1 + i % 2, f'Отзыв\n{i}', 100 + i, 2 + i,
+               '2020-01-13T23:20:02.422Z') for i in range(1, 4)),
+            (10, 2, 'Новый отзыв', 104, 1, '2020-01-13T23:20:02.422Z'),
+        ))
+        call_command(
+            'importdb', path=str(dataset), incremental=True, delete=True
+        )
+        output = capsys.readouterr().out
+        assert (
+            'review.csv: добавлено 1, обновлено 1, удалено 1, '
+            'без изменений 3'
+        ) in output, (
+            'Режим `--incremental` должен добавлять новые, обновлять '
+            'изменённые и удалять отсутствующие в файле строки.'
+        )
+        assert output.count('не изменился') == 3
+        assert sorted(Review.objects.values_list('pk', flat=True)) == [
+            1, 2, 3, 4, 10
+        ]
+        assert Review.objects.get(pk=1).score == 10
+        assert Title.objects.get(pk=1).rating == (10 + 4) // 2, (
+            'После инкрементального импорта рейтинг должен быть пересчитан.'
+        )
+
+    def test_07_comments_touch_titles(self, dataset):
+        from reviews.models import Title
+
+        call_command('importdb', path=str(dataset), incremental=True)
+        modified = Title.objects.get(pk=1).modified
+        write_csv(dataset, 'comments', (
+            ('id', 'review_id', 'text', 'author', 'pub_date'),
+            (1, 1, 'Комментарий', 101, '2020-01-13T23:20:02.422Z'),
+        ))
+        call_command('importdb', path=str(dataset), incremental=True)
+        assert Title.objects.get(pk=1).modified > modified, (
+            'Импорт комментариев должен обновлять `modified` произведений, '
+            'иначе списки комментариев отвечают устаревшим 304.'
+        )
+
+    def test_08_source_dates_and_counts(self, dataset, capsys):
+        from reviews.models import Review
+
+        call_command('importdb', path=str(dataset))
+        assert set(Review.objects.values_list('pub_date', flat=True)) == {
+            datetime(2020, 1, 13, 23, 20, 2, 422000, tzinfo=timezone.utc)
+        }, 'Импорт должен сохранять даты публикации из CSV-файлов.'
+        assert Review._meta.get_field('pub_date').auto_now_add, (
+            'После импорта новые отзывы должны получать текущую дату.'
+        )
+        capsys.readouterr()
+
+        call_command('importdb', path=str(dataset))
+        output = capsys.readouterr().out
+        assert 'review.csv успешно импортировалось: 0 строк' in output, (
+            'Строки, уже существующие в базе, не должны считаться '
+            'добавленными.'
+        )
+        assert 'конфликтующих с существующими: 5' in output
+
+    def test_09_delete_keeps_rows_with_missing_relations(self, dataset):
+        from reviews.models import Review
+
+        call_command('importdb', path=str(dataset), incremental=True)
+        write_csv(dataset, 'review', (
+            ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+            *((i + 1, 1 + i % 2, f'Отзыв\n{i}', 100 + i, 2 + i,
+               '2020-01-13T23:20:02.422Z') for i in range(4)),
+            (5, 1, 'Отзыв\n4', 999, 6, '2020-01-13T23:20:02.422Z'),
+        ))
+        call_command(
+            'importdb', path=str(dataset), incremental=True, delete=True
+        )
+        assert Review.objects.filter(pk=5).exists(), (
+            'Строки, пропущенные из-за несуществующих связей, есть в '
+            'CSV-файле и не должны удаляться с `--delete`.'
+        )
+
+    def test_10_read_ahead(self):
+        import time
+
+        from reviews.management.commands.importdb import ReadAhead
+
+        parsed = []
+
+        def batches(count, error=None):
+            for number in range(count):
+                parsed.append(number)
+                yield [number]
+            if error is not None:
+                raise error
+
+        reader = ReadAhead(batches(100), 3)
+        deadline = time.monotonic() + 5
+        while len(parsed) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert 4 <= len(parsed) <= 5, (
+            'Пока таблица ждёт блокировку записи, CSV должен разбираться '
+            'заранее, но не больше заданного числа пачек.'
+        )
+        assert list(reader) == [[number] for number in range(100)]
+        reader.close()
+
+        reader = ReadAhead(batches(2, ValueError('Ошибка разбора')), 3)
+        with pytest.raises(ValueError):
+            list(reader)
+        reader.close()
+
+        reader = ReadAhead(batches(100), 2)
+        reader.close()
+        assert not reader.thread.is_alive()
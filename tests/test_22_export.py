@@ -0,0 +1,148 @@
+import csv
+import gzip
+import io
+import json
+import os
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static/data/')
+
+
+def read_csv(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8', newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+@pytest.fixture
+def imported():
+    call_command('importdb', path=DATA_DIR)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Export:
+
+    def test_01_export_command(self, imported, tmp_path):
+        call_command('exportdb', path=str(tmp_path), chunk_size=7)
+        for name in ('users', 'category', 'genre', 'titles', 'genre_title'):
+            assert read_csv(tmp_path / f'{name}.csv') == read_csv(
+                os.path.join(DATA_DIR, f'{name}.csv')
+            ), (
+                f'Выгрузка `{name}.csv` должна совпадать с исходным файлом '
+                '`static/data/`.'
+            )
+        source = read_csv(os.path.join(DATA_DIR, 'review.csv'))
+        exported = read_csv(tmp_path / 'review.csv')
+        assert exported[0] == source[0]
+        assert exported[1:] == sorted(
+            source[1:], key=lambda row: int(row[0])
+        ), 'Выгрузка `review.csv` должна содержать все отзывы с датами.'
+
+        call_command(
+            'exportdb', path=str(tmp_path), export_format='ndjson', gzip=True,
+            tables=['titles'],
+        )
+        with gzip.open(tmp_path / 'titles.ndjson.gz', 'rt') as export:
+            titles = [json.loads(line) for line in export]
+        assert titles[0] == {
+            'id': 1, 'name': 'Побег из Шоушенка', 'year': 1994, 'category': 1
+        }
+        assert len(titles) == 32
+
+    def test_02_export_endpoint(self, imported, admin_client, user_client,
+                                client):
+        url = '/api/v1/export/titles/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Выгрузка `{url}` должна быть доступна только администратору.'
+        )
+        assert admin_client.get(
+            '/api/v1/export/unknown/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert admin_client.get(
+            f'{url}?type=xml'
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Ответ `{url}` должен отдаваться потоком.'
+        )
+        content = b''.join(response.streaming_content).decode()
+        assert list(csv.reader(io.StringIO(content))) == read_csv(
+            os.path.join(DATA_DIR, 'titles.csv')
+        )
+
+        response = admin_client.get(f'{url}?type=ndjson&compress=gzip')
+        assert response['Content-Type'] == 'application/gzip'
+        assert 'titles.ndjson.gz' in response['Content-Disposition']
+        lines = gzip.decompress(
+            b''.join(response.streaming_content)
+        ).decode().splitlines()
+        assert len(lines) == 32 and json.loads(lines[0])['id'] == 1
+
+    def test_03_export_endpoint_under_asgi(self, imported, token_admin):
+        path = '/api/v1/export/titles/'
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization',
+                 f'Bearer {token_admin["access"]}'.encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler())(scope, receive, send)
+        assert messages[0]['status'] == HTTPStatus.OK, (
+            f'Выгрузка `{path}` должна работать под ASGI.'
+        )
+        content = b''.join(
+            message.get('body', b'') for message in messages[1:]
+        ).decode()
+        assert list(csv.reader(io.StringIO(content))) == read_csv(
+            os.path.join(DATA_DIR, 'titles.csv')
+        )
+
+    def test_04_buffered_stream(self, imported, admin_client, monkeypatch):
+        from api import views
+        from reviews.export import buffer_chunks
+
+        assert list(buffer_chunks((b'ab', b'cd', b'e'), size=3)) == [
+            b'abcd', b'e'
+        ], 'Строки выгрузки должны объединяться в части заданного размера.'
+
+        def no_thread(content):
+            raise AssertionError('Под WSGI выгрузка не должна идти '
+                                 'через отдельный поток.')
+
+        monkeypatch.setattr(views, 'iterate_in_thread', no_thread)
+        response = admin_client.get('/api/v1/export/titles/')
+        parts = list(response.streaming_content)
+        assert len(parts) == 1, (
+            'Выгрузка должна отдаваться частями, а не по одной строке.'
+        )
+        assert list(csv.reader(io.StringIO(parts[0].decode()))) == read_csv(
+            os.path.join(DATA_DIR, 'titles.csv')
+        )
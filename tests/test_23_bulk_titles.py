@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+URL = '/api/v1/titles/bulk/'
+
+
+def make_titles(count, genres=('horror', 'comedy'), category='films'):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 2000 + number,
+            'genre': list(genres),
+            'category': category,
+            'description': f'Описание {number}',
+        }
+        for number in range(count)
+    ]
+
+
+def count_selects(queries, table):
+    return sum(
+        query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+        for query in queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkTitles:
+
+    def test_01_permissions_and_payload(self, client, user_client,
+                                        admin_client, settings):
+        data = make_titles(1)
+        assert client.post(
+            URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            f'`{URL}` должен быть доступен только администратору.'
+        )
+        assert admin_client.post(
+            URL, data=data[0], format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            f'`{URL}` должен принимать список произведений.'
+        )
+        settings.TITLES_BULK_LIMIT = 2
+        assert admin_client.post(
+            URL, data=make_titles(3), format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            f'`{URL}` должен ограничивать количество произведений в запросе.'
+        )
+
+    def test_02_partial_failure(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        data = [
+            *make_titles(1),
+            *make_titles(1, genres=('horror', 'unknown')),
+            *make_titles(1, category='unknown'),
+            {'name': 'Без года', 'genre': ['drama'], 'category': 'books'},
+            *make_titles(1, genres=('drama',), category='books'),
+        ]
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            f'Если часть произведений в запросе к `{URL}` некорректна - '
+            'должен вернуться ответ со статусом 207.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 400, 400, 400, 201
+        ], 'Ошибки в одном произведении не должны отменять остальные.'
+        assert [result['index'] for result in results] == list(range(5))
+        assert set(results[1]['errors']) == {'genre'}
+        assert set(results[2]['errors']) == {'category'}
+        assert set(results[3]['errors']) == {'year'}
+
+        created = results[0]['data']
+        assert [genre['slug'] for genre in created['genre']] == [
+            'horror', 'comedy'
+        ]
+        assert created['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert created['rating'] is None
+        response = admin_client.get(f'/api/v1/titles/{created["id"]}/')
+        assert response.json() == created, (
+            f'Произведения, созданные через `{URL}`, должны совпадать с '
+            'ответом эндпоинта произведения.'
+        )
+        assert admin_client.get(
+            '/api/v1/titles/?genre=drama'
+        ).json()['count'] == 1
+
+    @pytest.mark.parametrize('count', (1, 20))
+    def test_03_slugs_resolved_once(self, admin_client, count):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                URL, data=make_titles(count), format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()) == count
+        queries = context.captured_queries
+        assert count_selects(queries, 'reviews_category') == 1, (
+            f'`{URL}` должен находить все категории одним запросом.'
+        )
+        assert count_selects(queries, 'reviews_genre') <= 2, (
+            f'`{URL}` должен находить все жанры одним запросом.'
+        )
+        inserts = [
+            query for query in queries
+            if query['sql'].startswith('INSERT INTO "reviews_titlegenre"')
+        ]
+        assert len(inserts) == 1, (
+            'Связи произведений с жанрами должны создаваться одним запросом.'
+        )
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+URL = '/api/v1/reviews/bulk/'
+
+
+def count_queries(queries, prefix, table):
+    return sum(
+        query['sql'].startswith(prefix) and f'"{table}"' in query['sql']
+        for query in queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkReviews:
+
+    def test_01_permissions_and_payload(self, client, user_client,
+                                        admin_client, user, settings):
+        titles, _, _ = create_titles(admin_client)
+        data = [{
+            'title': titles[0]['id'], 'author': user.username,
+            'text': 'Отзыв', 'score': 5,
+        }]
+        assert client.post(
+            URL, data=data, content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            URL, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            f'`{URL}` должен быть доступен только администратору.'
+        )
+        assert admin_client.post(
+            URL, data=data[0], format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            f'`{URL}` должен принимать список отзывов.'
+        )
+        settings.REVIEWS_BULK_LIMIT = 1
+        assert admin_client.post(
+            URL, data=data * 2, format='json'
+        ).status_code == HTTPStatus.BAD_REQUEST, (
+            f'`{URL}` должен ограничивать количество отзывов в запросе.'
+        )
+
+    def test_02_partial_failure(self, admin_client, user_client, user,
+                                admin, moderator):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first, 'Уже есть', 4)
+        data = [
+            {'title': first, 'author': admin.username, 'text': 'А',
+             'score': 10},
+            {'title': first, 'author': user.username, 'text': 'Б', 'score': 1},
+            {'title': second, 'author': admin.username, 'text': 'В',
+             'score': 11},
+            {'title': 0, 'author': admin.username, 'text': 'Г', 'score': 2},
+            {'title': second, 'author': 'unknown', 'text': 'Д', 'score': 2},
+            {'title': second, 'author': moderator.username, 'text': 'Е',
+             'score': 6},
+            {'title': second, 'author': moderator.username, 'text': 'Ж',
+             'score': 3},
+        ]
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            f'Если часть отзывов в запросе к `{URL}` некорректна - '
+            'должен вернуться ответ со статусом 207.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 400, 400, 400, 400, 201, 400
+        ], 'Ошибки в одном отзыве не должны отменять остальные.'
+        assert set(results[1]['errors']) == {'non_field_errors'}, (
+            'Повторный отзыв автора на произведение должен отклоняться.'
+        )
+        assert set(results[2]['errors']) == {'score'}
+        assert set(results[3]['errors']) == {'title'}
+        assert set(results[4]['errors']) == {'author'}
+        assert set(results[6]['errors']) == {'non_field_errors'}, (
+            'Повторы внутри одного запроса должны отклоняться.'
+        )
+
+        created = results[0]['data']
+        response = admin_client.get(
+            f'/api/v1/titles/{first}/reviews/{created["id"]}/'
+        )
+        assert response.json() == created, (
+            f'Отзывы, созданные через `{URL}`, должны совпадать с '
+            'ответом эндпоинта отзыва.'
+        )
+        assert admin_client.get(
+            f'/api/v1/titles/{first}/'
+        ).json()['rating'] == 7, (
+            'Рейтинг произведения должен учитывать загруженные отзывы.'
+        )
+        assert admin_client.get(
+            f'/api/v1/titles/{second}/'
+        ).json()['rating'] == 6
+
+    def test_03_relations_resolved_once(self, admin_client, user, admin,
+                                        moderator, user_superuser):
+        titles, _, _ = create_titles(admin_client)
+        authors = (user, admin, moderator, user_superuser)
+        data = [
+            {'title': title['id'], 'author': author.username,
+             'text': 'Отзыв', 'score': 5}
+            for title in titles
+            for author in authors
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        queries = context.captured_queries
+        assert count_queries(queries, 'SELECT', 'reviews_title') == 1, (
+            f'`{URL}` должен находить все произведения одним запросом.'
+        )
+        assert count_queries(queries, 'INSERT', 'reviews_review') == 1, (
+            'Отзывы должны создаваться одним запросом.'
+        )
+        assert count_queries(
+            queries, 'UPDATE', 'reviews_title'
+        ) == len(titles), (
+            'Рейтинг каждого произведения должен обновляться один раз.'
+        )
@@ -0,0 +1,104 @@
+import asyncio
+import contextvars
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+
+from api.asyncviews import async_read_view
+from api.views import ReviewViewSet, TitleViewSet
+from tests.utils import create_reviews, create_titles
+
+request_var = contextvars.ContextVar('request_var', default=None)
+
+
+def async_reads(settings, workers=4):
+    settings.ASYNC_READS = {'ENABLED': True, 'WORKERS': workers}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AsyncReads:
+
+    def test_01_disabled_by_default(self, settings):
+        view = TitleViewSet.as_view({'get': 'list'})
+        assert not asyncio.iscoroutinefunction(view), (
+            'Без ASYNC_READS представления должны оставаться синхронными.'
+        )
+        async_reads(settings)
+        view = TitleViewSet.as_view({'get': 'list'})
+        assert asyncio.iscoroutinefunction(view), (
+            'С ASYNC_READS представления должны быть асинхронными.'
+        )
+        assert view.cls is TitleViewSet
+        assert view.actions == {'get': 'list'}
+        assert view.csrf_exempt
+
+    def test_02_same_responses(self, client, admin_client, user,
+                               user_client, moderator, moderator_client,
+                               settings):
+        _, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        async_reads(settings)
+        factory = RequestFactory()
+        cases = (
+            (TitleViewSet, {'get': 'list'}, '/api/v1/titles/', {}),
+            (TitleViewSet, {'get': 'retrieve'},
+             f'/api/v1/titles/{title_id}/', {'pk': title_id}),
+            (ReviewViewSet, {'get': 'list'},
+             f'/api/v1/titles/{title_id}/reviews/', {'title_id': title_id}),
+        )
+        for viewset, actions, url, kwargs in cases:
+            view = viewset.as_view(actions)
+            response = async_to_sync(view)(factory.get(url), **kwargs)
+            assert response.status_code == HTTPStatus.OK
+            assert json.loads(response.content) == client.get(url).json(), (
+                f'Асинхронный `{url}` должен отвечать как синхронный.'
+            )
+
+    def test_03_writes_are_not_pooled(self, admin_client, token_admin,
+                                      settings):
+        create_titles(admin_client)
+        async_reads(settings)
+        view = TitleViewSet.as_view({'get': 'list', 'post': 'create'})
+        request = RequestFactory().post(
+            '/api/v1/titles/',
+            data={'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+                  'category': 'films'},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token_admin["access"]}',
+        )
+        response = async_to_sync(view)(request)
+        assert response.status_code == HTTPStatus.CREATED
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 3
+
+    def test_04_bounded_pool_and_context(self, settings):
+        async_reads(settings, workers=2)
+        threads = set()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def view(request):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return request_var.get()
+
+        wrapped = async_read_view(view)
+        factory = RequestFactory()
+
+        async def run():
+            request_var.set('контекст')
+            return await asyncio.gather(*(
+                wrapped(factory.get('/')) for _ in range(6)
+            ))
+
+        assert async_to_sync(run)() == ['контекст'] * 6, (
+            'Представление должно выполняться в контексте запроса.'
+        )
+        assert len(threads) == 2, (
+            'Чтения должны выполняться в пуле из ASYNC_READS["WORKERS"] '
+            'потоков.'
+        )
@@ -0,0 +1,123 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.middleware import ReplicaRoutingMiddleware
+from api.views import TitleViewSet
+from api_yamdb.db_routers import ReplicaRouter, read_replica
+from reviews.models import Category, Review, Title
+from tests.utils import create_single_review, create_titles
+from users.models import User
+
+ALIAS = 'replica1'
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    connections.databases[ALIAS] = {
+        'ENGINE': 'api_yamdb.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    connections.ensure_defaults(ALIAS)
+    connections.prepare_test_settings(ALIAS)
+    settings.DATABASE_REPLICAS = [ALIAS]
+    yield ALIAS
+    connections[ALIAS].close()
+    del connections[ALIAS]
+    del connections.databases[ALIAS]
+
+
+def title_count(client):
+    return client.get('/api/v1/titles/').json()['count']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Replicas:
+
+    def test_01_router(self, settings):
+        router = ReplicaRouter()
+        settings.DATABASE_REPLICAS = [ALIAS]
+        assert router.db_for_read(Title) is None
+        token = read_replica.set(ALIAS)
+        try:
+            assert router.db_for_read(Title) == ALIAS, (
+                'Чтение из представлений с replica_reads должно '
+                'направляться в реплику.'
+            )
+            assert router.db_for_read(User) is None, (
+                'Пользователи должны читаться из основной базы.'
+            )
+            assert router.db_for_write(Title) == 'default'
+            settings.DATABASE_REPLICAS = []
+            assert router.db_for_read(Title) is None
+        finally:
+            read_replica.reset(token)
+        settings.DATABASE_REPLICAS = [ALIAS]
+        assert router.allow_migrate(ALIAS, 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is None
+
+    def test_02_sync_command(self, replica):
+        Category.objects.create(name='Фильм', slug='films')
+        with pytest.raises(CommandError):
+            call_command('syncreplicas', replicas=['unknown'])
+        call_command('syncreplicas')
+        assert Category.objects.using(replica).count() == 1, (
+            'Команда syncreplicas должна копировать основную базу в реплики.'
+        )
+        Category.objects.create(name='Книга', slug='books')
+        call_command('syncreplicas', replicas=[replica])
+        assert Category.objects.using(replica).count() == 2
+
+    def test_03_reads_from_replica(self, client, admin_client, replica):
+        create_titles(admin_client)
+        call_command('syncreplicas')
+        Title.objects.create(name='Только в основной базе', year=2000)
+        assert title_count(client) == 2, (
+            'GET-запросы к произведениям должны читаться из реплики.'
+        )
+        assert title_count(admin_client) == 3, (
+            'После записи чтения пользователя должны идти в основную базу.'
+        )
+        cache.clear()
+        assert title_count(admin_client) == 2, (
+            'Вне окна после записи чтения должны идти в реплику.'
+        )
+        assert read_replica.get() is None
+
+    def test_04_sticky_after_review(self, client, admin_client, user_client,
+                                    replica):
+        titles, _, _ = create_titles(admin_client)
+        call_command('syncreplicas')
+        cache.clear()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        assert Review.objects.count() == 1
+        assert user_client.get(url).json()['count'] == 1, (
+            'Автор должен сразу видеть свой отзыв.'
+        )
+        assert client.get(url).json()['count'] == 0, (
+            'Остальные пользователи читают отзывы из реплики.'
+        )
+
+    def test_05_one_replica_per_request(self, settings):
+        settings.DATABASE_REPLICAS = [
+            f'replica{number}' for number in range(1, 9)
+        ]
+        router = ReplicaRouter()
+        middleware = ReplicaRoutingMiddleware(lambda request: None)
+        view = TitleViewSet.as_view({'get': 'list'})
+        request = RequestFactory().get('/api/v1/titles/')
+        chosen = set()
+        for _ in range(20):
+            middleware.process_view(request, view, (), {})
+            aliases = {router.db_for_read(Title) for _ in range(20)}
+            assert len(aliases) == 1, (
+                'Все чтения одного запроса должны идти в одну реплику.'
+            )
+            chosen |= aliases
+            middleware.process_response(request, HttpResponse())
+            assert router.db_for_read(Title) is None
+        assert chosen <= set(settings.DATABASE_REPLICAS) and len(chosen) > 1
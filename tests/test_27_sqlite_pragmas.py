@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.sqlite3.base import apply_pragmas
+
+ALIAS = 'pragmas'
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    connections.databases[ALIAS] = {
+        'ENGINE': 'api_yamdb.sqlite3',
+        'NAME': str(tmp_path / 'pragmas.sqlite3'),
+    }
+    connections.ensure_defaults(ALIAS)
+    connections.prepare_test_settings(ALIAS)
+    yield connections[ALIAS]
+    connections[ALIAS].close()
+    del connections[ALIAS]
+    del connections.databases[ALIAS]
+
+
+def pragma(db, name):
+    with db.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SqlitePragmas:
+
+    def test_01_connection_profile(self):
+        connection.close()
+        connection.ensure_connection()
+        assert pragma(connection, 'busy_timeout') == 10000, (
+            'Новые соединения SQLite должны получать busy_timeout из '
+            'SQLITE_PRAGMAS.'
+        )
+        assert pragma(connection, 'synchronous') == 1
+        assert pragma(connection, 'cache_size') == -64000
+        assert pragma(connection, 'temp_store') == 2
+
+    def test_02_file_database_uses_wal(self, file_connection):
+        assert pragma(file_connection, 'journal_mode') == 'wal', (
+            'Файловая база SQLite должна работать в режиме WAL.'
+        )
+
+    def test_03_profile_is_configurable(self, file_connection, settings):
+        settings.SQLITE_PRAGMAS = {}
+        assert pragma(file_connection, 'journal_mode') == 'delete'
+        settings.SQLITE_PRAGMAS = {'journal_mode': 'wal; DROP TABLE x'}
+        file_connection.close()
+        with pytest.raises(ImproperlyConfigured):
+            file_connection.ensure_connection()
+
+    def test_04_apply_pragmas(self):
+        raw = sqlite3.connect(':memory:')
+        apply_pragmas(raw, {'busy_timeout': 1234, 'temp_store': 'memory'})
+        assert raw.execute('PRAGMA busy_timeout').fetchone()[0] == 1234
+        assert raw.execute('PRAGMA temp_store').fetchone()[0] == 2
+        raw.close()
+
+    def test_05_immediate_transactions(self, file_connection, settings):
+        with CaptureQueriesContext(file_connection) as context:
+            with transaction.atomic(using=ALIAS):
+                pass
+        assert context.captured_queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Транзакции должны сразу захватывать блокировку записи.'
+        )
+        settings.SQLITE_TRANSACTION_MODE = 'DEFERRED; DROP TABLE x'
+        with pytest.raises(ImproperlyConfigured):
+            with transaction.atomic(using=ALIAS):
+                pass
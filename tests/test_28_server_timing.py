@@ -0,0 +1,123 @@
+import importlib
+import re
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from rest_framework.renderers import JSONRenderer
+
+from api.timing import action_metrics, request_timings
+from tests.utils import create_titles
+
+METRIC = re.compile(r'^(\w+);dur=(\d+\.\d+)(?:;desc="(\d+) queries")?$')
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for item in header.split(', '):
+        match = METRIC.match(item)
+        assert match, f'Некорректный элемент Server-Timing: `{item}`'
+        metrics[match[1]] = (float(match[2]), match[3])
+    return metrics
+
+
+def reload_urls():
+    import api.urls
+    import api_yamdb.urls
+    importlib.reload(api.urls)
+    importlib.reload(api_yamdb.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_reads(settings):
+    disabled = settings.ASYNC_READS
+    settings.ASYNC_READS = {**disabled, 'ENABLED': True}
+    reload_urls()
+    yield
+    settings.ASYNC_READS = disabled
+    reload_urls()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ServerTiming:
+
+    def test_01_headers(self, client, admin_client, settings):
+        create_titles(admin_client)
+        settings.SERVER_TIMING = {'ENABLED': True, 'QUERY_COUNT_HEADER': True}
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+        assert response.has_header('Server-Timing'), (
+            'Ответ должен содержать заголовок Server-Timing.'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert set(metrics) == {'db', 'serialize', 'render', 'total'}
+        queries = len(context.captured_queries)
+        assert metrics['db'][1] == str(queries)
+        assert response['X-Query-Count'] == str(queries), (
+            'X-Query-Count должен совпадать с числом SQL-запросов.'
+        )
+        assert metrics['total'][0] >= metrics['db'][0]
+        assert request_timings.get() is None
+
+    def test_02_optional_headers(self, client, settings):
+        settings.SERVER_TIMING = {
+            'ENABLED': True, 'QUERY_COUNT_HEADER': False
+        }
+        response = client.get('/api/v1/titles/')
+        assert response.has_header('Server-Timing')
+        assert not response.has_header('X-Query-Count')
+        settings.SERVER_TIMING = {'ENABLED': False, 'QUERY_COUNT_HEADER': True}
+        response = client.get('/api/v1/titles/')
+        assert not response.has_header('Server-Timing'), (
+            'Без SERVER_TIMING["ENABLED"] заголовок не должен добавляться.'
+        )
+        assert not response.has_header('X-Query-Count')
+
+    def test_03_metrics_endpoint(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        action_metrics.clear()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert user_client.get('/api/v1/metrics/').status_code == 403, (
+            'Метрики должны быть доступны только администратору.'
+        )
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        data = response.json()
+        actions = data['actions']
+        assert actions['TitleViewSet.list']['requests'] == 2, (
+            'Метрики должны собираться по действиям представлений.'
+        )
+        assert actions['TitleViewSet.retrieve']['requests'] == 1
+        assert set(actions['TitleViewSet.list']) == {
+            'requests', 'queries', 'db_ms', 'serialize_ms', 'render_ms',
+            'total_ms',
+        }
+        assert actions['TitleViewSet.list']['queries'] > 0
+        assert set(data['caches']) == {'users', 'tokens'}
+        assert 'hits' in data['caches']['users']
+
+    def test_04_render_time_with_async_reads(self, client, settings,
+                                             async_reads, monkeypatch):
+        settings.SERVER_TIMING = {
+            'ENABLED': True, 'QUERY_COUNT_HEADER': False
+        }
+        render = JSONRenderer.render
+
+        def slow_render(self, *args, **kwargs):
+            time.sleep(0.05)
+            return render(self, *args, **kwargs)
+
+        monkeypatch.setattr(JSONRenderer, 'render', slow_render)
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert metrics['render'][0] >= 50, (
+            'С ASYNC_READS время отрисовки ответа должно попадать в '
+            '`render`, а не в `serialize`.'
+        )
+        assert metrics['serialize'][0] < 50